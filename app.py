@@ -8,105 +8,356 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-import google.generativeai as genai
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.prompts import PromptTemplate
+# Heavy SDK and document-parser imports live inside the functions that use them
+# so the first paint doesn't wait on langchain/genai/PyPDF2 loading
 import os
 from dotenv import load_dotenv
-from PyPDF2 import PdfReader
-from docx import Document
 import io
+from pathlib import Path
+import hashlib
 import json
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
-from streamlit_option_menu import option_menu
-import requests
+import re
 import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+try:
+    import xxhash  # Non-cryptographic cache keys - much faster than hashlib, blake2b is the fallback
+except ImportError:
+    xxhash = None
+try:
+    import orjson  # Faster parsing of Gemini JSON, re-run on every streamed chunk
+except ImportError:
+    orjson = None
+try:
+    import ahocorasick  # pyahocorasick - single-pass multi-keyword matching (resume rebuild, suggestion categories)
+except ImportError:
+    ahocorasick = None
 
 # Load environment variables
 load_dotenv()
 
+@st.cache_resource(show_spinner=False)
+def _configure_genai(api_key):
+    """Configure the Gemini SDK once per API key for the whole server process"""
+    import google.generativeai as genai
+    
+    genai.configure(api_key=api_key)
+    return True
+
 # Configure Google AI - Using same pattern as DOC-GPT
 def configure_ai():
-    """Configure Google AI with error handling"""
-    try:
-        api_key = os.getenv("GOOGLE_API_KEY")
-        if not api_key:
-            st.error("🔑 GOOGLE_API_KEY not found in environment variables")
-            st.stop()
-        genai.configure(api_key=api_key)
-        return True
-    except Exception as e:
-        st.error(f"❌ Error configuring Google AI: {str(e)}")
+    """Check the API key up front; the SDK itself is configured when the first model is built"""
+    if not os.getenv("GOOGLE_API_KEY"):
+        st.error("🔑 GOOGLE_API_KEY not found in environment variables")
         st.stop()
-        return False
+    return True
 
 # Resume text extraction functions - Using same pattern as DOC-GPT
 def extract_text_from_pdf(file):
-    """Extract text from PDF file"""
+    """Extract text from PDF file; parser errors propagate"""
     try:
-        pdf_reader = PdfReader(file)
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text()
-        return text
-    except Exception as e:
-        st.error(f"Error reading PDF: {str(e)}")
-        return None
+        import fitz  # Optional PyMuPDF (AGPL-3.0, not in requirements.txt) - much faster text extraction, PyPDF2 is the default
+    except ImportError:
+        fitz = None
+    
+    if fitz is not None:
+        with fitz.open(stream=file.getvalue(), filetype="pdf") as doc:
+            return "\n".join(page.get_text("text") for page in doc)
+    
+    from PyPDF2 import PdfReader
+    
+    pdf_reader = PdfReader(file)
+    # Pages joined with a newline, the same as the PyMuPDF path
+    return "\n".join(page.extract_text() or "" for page in pdf_reader.pages)
 
 def extract_text_from_docx(file):
-    """Extract text from DOCX file"""
+    """Extract text from DOCX file; parser errors propagate"""
+    from docx import Document
+    
+    doc = Document(file)
+    return "".join(paragraph.text + "\n" for paragraph in doc.paragraphs)
+
+def make_text_preview(text, limit=500):
+    """Short preview of extracted text for the sidebar"""
+    return text[:limit] + "..." if len(text) > limit else text
+
+@st.cache_data(show_spinner=False, max_entries=16, ttl=3600)
+def _extract_text_cached(file_hash, _file_bytes, file_type):
+    """Parse an uploaded document once per unique file content hash.
+    
+    Failures raise instead of returning None so they are never cached and a re-upload can retry.
+    """
+    if file_type == "application/pdf":
+        return extract_text_from_pdf(io.BytesIO(_file_bytes))
+    elif file_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
+        return extract_text_from_docx(io.BytesIO(_file_bytes))
+    raise ValueError("Unsupported file type. Please upload PDF or DOCX files only.")
+
+def get_upload_data(uploaded_file):
+    """(content hash, bytes, MIME type) for an upload - the arguments of _extract_text_cached"""
+    file_bytes = uploaded_file.getvalue()
+    return get_content_hash(file_bytes), file_bytes, uploaded_file.type
+
+def extract_upload_text(upload_data):
+    """Text of an upload from get_upload_data, or None after showing the parse error"""
     try:
-        doc = Document(file)
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text
+        return _extract_text_cached(*upload_data)
     except Exception as e:
-        st.error(f"Error reading DOCX: {str(e)}")
+        st.error(f"Error reading file: {str(e)}")
         return None
 
-def extract_resume_text(uploaded_file):
-    """Extract text from uploaded resume file"""
-    if uploaded_file is not None:
-        file_type = uploaded_file.type
-        
-        if file_type == "application/pdf":
-            return extract_text_from_pdf(uploaded_file)
-        elif file_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-            return extract_text_from_docx(uploaded_file)
-        else:
-            st.error("Unsupported file type. Please upload PDF or DOCX files only.")
-            return None
-    return None
+def extract_pending_uploads():
+    """Extract text from uploads that have not been parsed yet; False if extraction fails"""
+    if not st.session_state.resume_text and st.session_state.resume_file:
+        with st.spinner("📖 Extracting text from your resume..."):
+            resume_text = extract_upload_text(st.session_state.resume_file)
+        if not resume_text:
+            st.error("❌ Failed to extract text from the resume file.")
+            return False
+        st.session_state.update(resume_text=resume_text, resume_preview_text=make_text_preview(resume_text))
+    
+    if not st.session_state.job_description and st.session_state.jd_file:
+        with st.spinner("📖 Extracting text from job description..."):
+            jd_text = extract_upload_text(st.session_state.jd_file)
+        if not jd_text:
+            st.error("❌ Failed to extract text from the JD file.")
+            return False
+        st.session_state.update(job_description=jd_text, jd_preview_text=make_text_preview(jd_text))
+    
+    return True
+
+# Analysis response schemas - Gemini JSON mode enforces these directly, so the
+# prompts no longer need to spell out an example of the full JSON structure
+_STRING_LIST = {"type": "array", "items": {"type": "string"}}
+
+_SECTION_NAMES = ("contact_info", "professional_summary", "work_experience", "education", "skills")
+
+_SECTION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "score": {"type": "integer", "description": "0-100"},
+        "issues": _STRING_LIST,
+        "suggestions": _STRING_LIST,
+        "content": {"type": "string", "description": "Section text extracted verbatim from the resume"}
+    },
+    "required": ["score", "issues", "suggestions", "content"]
+}
+
+_FORMATTING_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "score": {"type": "integer", "description": "0-100"},
+        "issues": _STRING_LIST,
+        "suggestions": _STRING_LIST
+    },
+    "required": ["score", "issues", "suggestions"]
+}
+
+_ANALYSIS_RESPONSE_SCHEMA_GENERAL = {
+    "type": "object",
+    "properties": {
+        "overall_score": {"type": "integer", "description": "0-100"},
+        "ats_compatibility": {"type": "integer", "description": "0-100"},
+        "sections_analysis": {
+            "type": "object",
+            "properties": {name: _SECTION_SCHEMA for name in _SECTION_NAMES},
+            "required": list(_SECTION_NAMES)
+        },
+        "keywords": {
+            "type": "object",
+            "properties": {
+                "missing_keywords": _STRING_LIST,
+                "found_keywords": _STRING_LIST,
+                "keyword_density": {"type": "number", "description": "Percentage"}
+            },
+            "required": ["missing_keywords", "found_keywords", "keyword_density"]
+        },
+        "formatting": _FORMATTING_SCHEMA,
+        "overall_recommendations": _STRING_LIST,
+        "ats_issues": _STRING_LIST,
+        "improvement_priority": {**_STRING_LIST, "description": "Ordered list of what to fix first"}
+    },
+    "required": [
+        "overall_score", "ats_compatibility", "sections_analysis", "keywords",
+        "formatting", "overall_recommendations", "ats_issues", "improvement_priority"
+    ]
+}
+
+_ANALYSIS_RESPONSE_SCHEMA_JOB = {
+    "type": "object",
+    "properties": {
+        **_ANALYSIS_RESPONSE_SCHEMA_GENERAL["properties"],
+        "overall_score": {"type": "integer", "description": "0-100, based on match with the job"},
+        "job_match_score": {"type": "integer", "description": "0-100"},
+        "keywords": {
+            "type": "object",
+            "properties": {
+                "missing_keywords": {**_STRING_LIST, "description": "Important job posting keywords not found in the resume"},
+                "found_keywords": {**_STRING_LIST, "description": "Job-relevant keywords found in the resume"},
+                "keyword_density": {"type": "number", "description": "Percentage"},
+                "required_skills_missing": {**_STRING_LIST, "description": "Required skills from the job not mentioned"},
+                "required_skills_found": {**_STRING_LIST, "description": "Required skills from the job that are mentioned"}
+            },
+            "required": [
+                "missing_keywords", "found_keywords", "keyword_density",
+                "required_skills_missing", "required_skills_found"
+            ]
+        },
+        "job_specific_analysis": {
+            "type": "object",
+            "properties": {
+                "requirements_match": {"type": "integer", "description": "Percentage of requirements met"},
+                "qualification_gaps": _STRING_LIST,
+                "strength_alignment": {**_STRING_LIST, "description": "How candidate strengths align with job needs"},
+                "experience_relevance": {"type": "integer", "description": "0-100"}
+            },
+            "required": ["requirements_match", "qualification_gaps", "strength_alignment", "experience_relevance"]
+        }
+    },
+    "required": _ANALYSIS_RESPONSE_SCHEMA_GENERAL["required"] + ["job_match_score", "job_specific_analysis"]
+}
+
+_RESPONSE_SCHEMAS = {
+    "analysis_job": _ANALYSIS_RESPONSE_SCHEMA_JOB,
+    "analysis_general": _ANALYSIS_RESPONSE_SCHEMA_GENERAL
+}
+
+# Analysis prompts - static instructions go in the system message so Gemini
+# sees an identical prefix on every call; only the resume/JD vary per request
+_ANALYSIS_INSTRUCTIONS_JOB = """You are an expert ATS (Applicant Tracking System) specialist. Analyze how well this resume matches the specific job requirements and populate the response schema.
+
+Section suggestions should be job-specific, and recommendations, ATS issues and improvement priorities should target THIS application.
+
+Focus on:
+1. How well the resume matches THIS specific job
+2. Required vs. preferred qualifications alignment
+3. Keyword optimization for THIS job posting
+4. ATS compatibility for THIS application
+5. Specific gaps to address for THIS role
+"""
+
+_ANALYSIS_INSTRUCTIONS_GENERAL = """You are an expert ATS (Applicant Tracking System) and HR specialist. Analyze the following resume, provide a comprehensive evaluation and populate the response schema.
+
+Focus on:
+1. ATS compatibility (keywords, formatting, structure)
+2. Content quality and relevance
+3. Professional presentation
+4. Missing information
+5. Industry standards compliance
+"""
+
+_ANALYSIS_INPUT_JOB = """JOB DESCRIPTION:
+{job_description}
+
+RESUME TO ANALYZE:
+{resume_text}
+"""
+
+_ANALYSIS_INPUT_GENERAL = """Resume Text:
+{resume_text}
+"""
 
 # AI Analysis functions - Using EXACT same pattern as DOC-GPT
-def get_conversational_chain():
+@st.cache_resource(show_spinner=False)
+def _create_chat_model(json_mode=False, response_schema_name=None):
+    """Build the Gemini chat client once and share it across reruns and sessions"""
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    
+    # Deferred from page load so the first paint doesn't import google.generativeai
+    _configure_genai(os.getenv("GOOGLE_API_KEY"))
+    
+    options = {}
+    if json_mode:
+        # Gemini JSON mode guarantees a syntactically valid JSON body with no prose around it
+        options["response_mime_type"] = "application/json"
+    if response_schema_name:
+        options["response_schema"] = _RESPONSE_SCHEMAS[response_schema_name]
+    
+    return ChatGoogleGenerativeAI(
+        model="gemini-2.0-flash-exp",
+        temperature=0.3,
+        **options
+    )
+
+def get_conversational_chain(json_mode=False, response_schema_name=None):
     """Create conversational chain with error handling using Gemini 2.0 Flash - Same as DOC-GPT"""
     try:
-        model = ChatGoogleGenerativeAI(
-            model="gemini-2.0-flash-exp",
-            temperature=0.3
-        )
-        return model
+        # Construction errors propagate out of the cached factory, so failures are never cached
+        return _create_chat_model(json_mode, response_schema_name)
     except Exception as e:
         st.error(f"❌ Error creating conversational chain: {str(e)}")
         return None
 
-def get_content_hash(text):
-    """Generate a hash of the content to detect changes"""
-    import hashlib
-    return hashlib.md5(text.encode()).hexdigest()
+# Same substitutions as html.escape, applied in a single translate pass
+HTML_ESCAPES = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#x27;'})
 
-def is_resume_already_analyzed(resume_text):
+def escape_html(value):
+    """Escape a model- or user-provided value before it goes into unsafe_allow_html markup"""
+    return str(value).translate(HTML_ESCAPES)
+
+def get_content_hash(content):
+    """Generate a hash of the content (text or raw bytes) to detect changes"""
+    data = content if isinstance(content, bytes) else content.encode()
+    if xxhash is not None:
+        return xxhash.xxh3_64_hexdigest(data)
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+def get_analysis_hash(resume_text, job_description=None):
+    """Generate the cache key for a resume + job description pair"""
+    return f"{get_content_hash(resume_text)}:{get_content_hash(job_description or '')}"
+
+def is_resume_already_analyzed(resume_text, job_description=None):
     """Check if this resume content has already been analyzed"""
     if not resume_text or not st.session_state.last_analyzed_hash:
         return False
     
-    current_hash = get_content_hash(resume_text)
+    current_hash = get_analysis_hash(resume_text, job_description)
     return current_hash == st.session_state.last_analyzed_hash
 
+# ~10K tokens - longer uploads are almost always full reports/appendices, not resumes
+MAX_RESUME_CHARS = 40_000
+
+# Headings of the resume sections worth keeping when a document has to be trimmed
+_CORE_SECTION_HEADER_RE = re.compile(
+    r'^[ \t]*(?:professional\s+|work\s+|technical\s+|core\s+)?'
+    r'(?:summary|profile|objective|experience|employment(?:\s+history)?|education|skills|projects|certifications)'
+    r'[ \t]*:?[ \t]*$',
+    re.IGNORECASE | re.MULTILINE
+)
+# Where a core section ends besides the next core heading: a typical trailing/appendix heading line.
+# ALL-CAPS lines are not boundaries - employer and job-title lines are often written that way.
+_TRAILING_SECTION_HEADER_RE = re.compile(
+    r'^[ \t]*(?:(?:appendix|annex)\b[^\n]{0,40}'
+    r'|(?:references|publications|awards(?:\s+(?:and|&)\s+honou?rs)?|honou?rs|interests|hobbies'
+    r'|languages|volunteer(?:ing|\s+experience|\s+work)?|activities)[ \t]*:?)[ \t]*$',
+    re.IGNORECASE | re.MULTILINE
+)
+
+def _smart_truncate(resume_text, max_chars=MAX_RESUME_CHARS):
+    """Trim an oversized resume to its header plus core sections, within max_chars"""
+    core_starts = [match.start() for match in _CORE_SECTION_HEADER_RE.finditer(resume_text)]
+    if not core_starts:
+        return resume_text[:max_chars]
+    
+    # Each core section runs until the next core or trailing heading
+    boundaries = sorted({match.start() for match in _TRAILING_SECTION_HEADER_RE.finditer(resume_text)} | set(core_starts))
+    boundaries.append(len(resume_text))
+    
+    # Contact info and anything before the first core heading is kept first
+    parts = [resume_text[:core_starts[0]][:max_chars]]
+    budget = max_chars - len(parts[0])
+    for start in core_starts:
+        if budget <= 0:
+            break
+        end = next(boundary for boundary in boundaries if boundary > start)
+        section = resume_text[start:end][:budget]
+        parts.append(section)
+        budget -= len(section)
+    
+    return "".join(parts)
+
 def analyze_resume_with_gemini(resume_text, job_description=None):
     """Analyze resume using Gemini AI - Enhanced for job-specific analysis"""
     try:
@@ -114,209 +365,221 @@ def analyze_resume_with_gemini(resume_text, job_description=None):
             st.error("❌ No resume text to analyze")
             return None
         
-        model = get_conversational_chain()
-        if not model:
-            return None
-        
-        # Create job-specific or general analysis prompt
-        if job_description and job_description.strip():
-            # Job-specific analysis
-            analysis_prompt = f"""
-                You are an expert ATS (Applicant Tracking System) specialist. Analyze how well this resume matches the specific job requirements.
-
-                JOB DESCRIPTION:
-                {job_description}
-
-                RESUME TO ANALYZE:
-                {resume_text}
-
-                IMPORTANT: Return ONLY a valid JSON object with the following exact structure. Do not include any text before or after the JSON:
-
-                {{
-                    "overall_score": <score_0_to_100_based_on_job_match>,
-                    "ats_compatibility": <score_0_to_100>,
-                    "job_match_score": <score_0_to_100>,
-                    "sections_analysis": {{
-                        "contact_info": {{
-                            "score": <score_0_to_100>,
-                            "issues": ["list of issues"],
-                            "suggestions": ["list of job-specific suggestions"],
-                            "content": "extracted content"
-                        }},
-                        "professional_summary": {{
-                            "score": <score_0_to_100>,
-                            "issues": ["alignment issues with job requirements"],
-                            "suggestions": ["how to better match job requirements"],
-                            "content": "extracted content"
-                        }},
-                        "work_experience": {{
-                            "score": <score_0_to_100>,
-                            "issues": ["missing relevant experience for this job"],
-                            "suggestions": ["how to highlight relevant experience"],
-                            "content": "extracted content"
-                        }},
-                        "education": {{
-                            "score": <score_0_to_100>,
-                            "issues": ["education requirements vs candidate"],
-                            "suggestions": ["education positioning for this role"],
-                            "content": "extracted content"
-                        }},
-                        "skills": {{
-                            "score": <score_0_to_100>,
-                            "issues": ["missing required skills from job posting"],
-                            "suggestions": ["which skills to emphasize/add"],
-                            "content": "extracted content"
-                        }}
-                    }},
-                    "keywords": {{
-                        "missing_keywords": ["important keywords from job posting not found in resume"],
-                        "found_keywords": ["job-relevant keywords found in resume"],
-                        "keyword_density": <percentage>,
-                        "required_skills_missing": ["specific skills from job requirements not mentioned"],
-                        "required_skills_found": ["specific skills from job requirements that are mentioned"]
-                    }},
-                    "formatting": {{
-                        "score": <score_0_to_100>,
-                        "issues": ["formatting issues"],
-                        "suggestions": ["formatting suggestions"]
-                    }},
-                    "job_specific_analysis": {{
-                        "requirements_match": <percentage_of_requirements_met>,
-                        "qualification_gaps": ["list of missing qualifications"],
-                        "strength_alignment": ["how candidate strengths align with job needs"],
-                        "experience_relevance": <score_0_to_100>
-                    }},
-                    "overall_recommendations": ["top recommendations for this specific job"],
-                    "ats_issues": ["ATS-specific issues for this application"],
-                    "improvement_priority": ["ordered list of what to fix first for this job"]
-                }}
-
-                Focus on:
-                1. How well the resume matches THIS specific job
-                2. Required vs. preferred qualifications alignment
-                3. Keyword optimization for THIS job posting
-                4. ATS compatibility for THIS application
-                5. Specific gaps to address for THIS role
-
-                Return ONLY the JSON object, nothing else.
-                """
-        else:
-            # General analysis (fallback)
-            analysis_prompt = f"""
-                You are an expert ATS (Applicant Tracking System) and HR specialist. Analyze the following resume and provide a comprehensive evaluation.
-
-                Resume Text:
-                {resume_text}
-
-                IMPORTANT: Return ONLY a valid JSON object with the following exact structure. Do not include any text before or after the JSON:
-
-                {{
-                    "overall_score": <score_0_to_100>,
-                    "ats_compatibility": <score_0_to_100>,
-                    "sections_analysis": {{
-                        "contact_info": {{
-                            "score": <score_0_to_100>,
-                            "issues": ["list of issues"],
-                            "suggestions": ["list of suggestions"],
-                            "content": "extracted content"
-                        }},
-                        "professional_summary": {{
-                            "score": <score_0_to_100>,
-                            "issues": ["list of issues"],
-                            "suggestions": ["list of suggestions"],
-                            "content": "extracted content"
-                        }},
-                        "work_experience": {{
-                            "score": <score_0_to_100>,
-                            "issues": ["list of issues"],
-                            "suggestions": ["list of suggestions"],
-                            "content": "extracted content"
-                        }},
-                        "education": {{
-                            "score": <score_0_to_100>,
-                            "issues": ["list of issues"],
-                            "suggestions": ["list of suggestions"],
-                            "content": "extracted content"
-                        }},
-                        "skills": {{
-                            "score": <score_0_to_100>,
-                            "issues": ["list of issues"],
-                            "suggestions": ["list of suggestions"],
-                            "content": "extracted content"
-                        }}
-                    }},
-                    "keywords": {{
-                        "missing_keywords": ["list of important missing keywords"],
-                        "found_keywords": ["list of found relevant keywords"],
-                        "keyword_density": <percentage>
-                    }},
-                    "formatting": {{
-                        "score": <score_0_to_100>,
-                        "issues": ["formatting issues"],
-                        "suggestions": ["formatting suggestions"]
-                    }},
-                    "overall_recommendations": ["list of top recommendations"],
-                    "ats_issues": ["list of ATS-specific issues"],
-                    "improvement_priority": ["ordered list of what to fix first"]
-                }}
-
-                Focus on:
-                1. ATS compatibility (keywords, formatting, structure)
-                2. Content quality and relevance
-                3. Professional presentation
-                4. Missing information
-                5. Industry standards compliance
-
-                Return ONLY the JSON object, nothing else.
-                """
-        
-        # Use same response handling as before
-        response = model.invoke(analysis_prompt)
-        
-        if response and hasattr(response, 'content'):
+        if len(resume_text) > MAX_RESUME_CHARS:
+            resume_text = _smart_truncate(resume_text)
+            st.warning(f"⚠️ Your document is very long, so it was trimmed to the contact details and core sections (max {MAX_RESUME_CHARS:,} characters) before analysis.")
+        
+        # Same resume + JD as the results on screen - skip the Gemini round-trip, unless those
+        # results are the non-JSON fallback, which Analyze should retry
+        if (is_resume_already_analyzed(resume_text, job_description) and st.session_state.analysis_results
+                and not st.session_state.analysis_fallback):
+            return st.session_state.analysis_results
+        
+        resume_hash = get_content_hash(resume_text)
+        jd_hash = get_content_hash(job_description or '')
+        is_fallback = False
+        try:
+            analysis = _cached_analyze(resume_hash, jd_hash)
+        except CacheMiss:
+            response_text = stream_analysis(resume_text, job_description)
             try:
-                # Clean the response content to extract JSON
-                response_text = response.content.strip()
-                
-                # Try to find JSON in the response
-                json_start = response_text.find('{')
-                json_end = response_text.rfind('}') + 1
-                
-                if json_start != -1 and json_end > json_start:
-                    json_text = response_text[json_start:json_end]
-                    analysis = json.loads(json_text)
-                    return analysis
-                else:
-                    # If no JSON found, try parsing the whole response
-                    analysis = json.loads(response_text)
-                    return analysis
-                    
-            except json.JSONDecodeError as e:
-                # If JSON parsing fails, create a structured response from text
+                analysis = _cached_analyze(resume_hash, jd_hash, response_text)
+            except json.JSONDecodeError:
+                # JSON mode output can still be cut short (e.g. token limit) - build a structured response from text, for this run only
                 st.warning("⚠️ Received non-JSON response, creating structured analysis...")
-                return parse_analysis_response(response.content)
-        else:
-            st.error("❌ Could not generate analysis")
-            return None
+                analysis = dedupe_analysis_keywords(parse_analysis_response(response_text))
+                is_fallback = True
+        
+        # A retry can replace a fallback under the same hash, so the built views are dropped too
+        st.session_state.update(
+            last_analyzed_hash=f"{resume_hash}:{jd_hash}",
+            analysis_fallback=is_fallback,
+            analysis_views={},
+        )
+        return analysis
                 
     except Exception as e:
         st.error(f"❌ Error analyzing resume: {str(e)}")
         return None
 
+class CacheMiss(Exception):
+    """Raised by a cached step that was called without the model reply it needs"""
+
+# Re-parse the partial analysis for the live preview at most once per this many streamed characters
+PREVIEW_PARSE_INTERVAL = 2_000
+
+@st.cache_data(show_spinner=False, max_entries=64, ttl=3600)
+def _cached_analyze(resume_hash, jd_hash, _response_text=None):
+    """Decoded analysis for one resume + job description hash pair.
+    
+    Called without a reply to look the pair up: a miss raises CacheMiss, and exceptions are
+    never cached, so the caller streams Gemini's reply and calls again with it to parse and store.
+    A reply that is not valid JSON raises json.JSONDecodeError, so the fallback is never cached either.
+    """
+    if _response_text is None:
+        raise CacheMiss(resume_hash, jd_hash)
+    return dedupe_analysis_keywords(decode_json_response(_response_text))
+
+def stream_analysis(resume_text, job_description=None):
+    """Stream the Gemini analysis reply, previewing the partial JSON while it arrives"""
+    # Create job-specific or general analysis prompt
+    if job_description and job_description.strip():
+        # Job-specific analysis
+        response_schema_name = "analysis_job"
+        analysis_prompt = [
+            ("system", _ANALYSIS_INSTRUCTIONS_JOB),
+            ("human", _ANALYSIS_INPUT_JOB.format(job_description=job_description, resume_text=resume_text)),
+        ]
+    else:
+        # General analysis (fallback)
+        response_schema_name = "analysis_general"
+        analysis_prompt = [
+            ("system", _ANALYSIS_INSTRUCTIONS_GENERAL),
+            ("human", _ANALYSIS_INPUT_GENERAL.format(resume_text=resume_text)),
+        ]
+    
+    model = get_conversational_chain(json_mode=True, response_schema_name=response_schema_name)
+    if not model:
+        raise RuntimeError("Could not create Gemini model")
+    
+    # Stream the response so partial sections render while Gemini is still generating;
+    # the buffer is only joined and re-parsed every PREVIEW_PARSE_INTERVAL characters
+    parts = []
+    received = 0
+    next_preview_at = PREVIEW_PARSE_INTERVAL
+    preview = st.empty()
+    for chunk in model.stream(analysis_prompt):
+        if chunk and hasattr(chunk, 'content') and chunk.content:
+            parts.append(chunk.content)
+            received += len(chunk.content)
+            if received >= next_preview_at:
+                next_preview_at = received + PREVIEW_PARSE_INTERVAL
+                partial = parse_partial_json("".join(parts))
+                if partial:
+                    preview.json(partial, expanded=False)
+    preview.empty()
+    
+    response_text = "".join(parts)
+    if not response_text:
+        raise RuntimeError("Could not generate analysis")
+    return response_text
+
+# Keyword lists that are rendered one chip/row per entry, as (found field, missing field) pairs
+KEYWORD_LIST_FIELDS = (('found_keywords', 'missing_keywords'), ('required_skills_found', 'required_skills_missing'))
+
+def dedupe_keywords(keywords, exclude=frozenset()):
+    """Drop blank entries, keys in `exclude` and case/whitespace variants of earlier ones, keeping the first spelling"""
+    seen = set(exclude)
+    unique = []
+    for keyword in keywords:
+        keyword = str(keyword).strip()
+        key = keyword.lower()
+        if key and key not in seen:
+            seen.add(key)
+            unique.append(keyword)
+    return unique
+
+def dedupe_analysis_keywords(analysis):
+    """Dedupe the keyword lists of an analysis in place, once, before it is cached and rendered"""
+    keywords = analysis.get('keywords') if isinstance(analysis, dict) else None
+    if isinstance(keywords, dict):
+        for found_field, missing_field in KEYWORD_LIST_FIELDS:
+            found = keywords.get(found_field)
+            if isinstance(found, list):
+                found = keywords[found_field] = dedupe_keywords(found)
+            else:
+                found = ()
+            if isinstance(keywords.get(missing_field), list):
+                # A keyword the model reports as both found and missing is shown only as found
+                found_keys = frozenset(keyword.lower() for keyword in found)
+                keywords[missing_field] = dedupe_keywords(keywords[missing_field], found_keys)
+    return analysis
+
+_JSON_DECODER = json.JSONDecoder()
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch the same exception either way
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+def decode_json_response(response_text):
+    """Decode the first JSON object in a model response in a single parser pass"""
+    # raw_decode stops at the end of the object, so trailing text or stray braces are ignored
+    json_start = response_text.find('{')
+    if json_start == -1:
+        raise json.JSONDecodeError("No JSON object found", response_text, 0)
+    
+    # JSON mode normally returns a bare object - take the fast path first
+    if json_start == 0:
+        try:
+            return _json_loads(response_text)
+        except json.JSONDecodeError:
+            pass
+    
+    parsed, _json_end = _JSON_DECODER.raw_decode(response_text, json_start)
+    return parsed
+
+def parse_partial_json(buffer):
+    """Best-effort parse of an incomplete JSON stream by closing open strings and brackets"""
+    json_start = buffer.find('{')
+    if json_start == -1:
+        return None
+    
+    text = buffer[json_start:]
+    closers = []
+    last_comma = None
+    in_string = False
+    escaped = False
+    for index, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == '{':
+            closers.append('}')
+        elif char == '[':
+            closers.append(']')
+        elif char in '}]' and closers:
+            closers.pop()
+        elif char == ',':
+            last_comma = (index, list(closers))
+    
+    if in_string:
+        if escaped:
+            text = text[:-1]
+        text += '"'
+    
+    # Drop a dangling key, colon or comma so the closed document stays valid
+    candidate = text.rstrip()
+    while candidate and candidate[-1] in ',:':
+        candidate = candidate[:-1].rstrip()
+    
+    try:
+        return _json_loads(candidate + "".join(reversed(closers)))
+    except json.JSONDecodeError:
+        pass
+    
+    # Fall back to the last complete member before the trailing partial token
+    if last_comma:
+        index, comma_closers = last_comma
+        try:
+            return _json_loads(text[:index] + "".join(reversed(comma_closers)))
+        except json.JSONDecodeError:
+            pass
+    return None
+
+# Non-JSON fallback: stripped lines longer than 20 chars that don't start with { } or "
+# and don't look like a "score: ..." field
+_RECOMMENDATION_LINE_RE = re.compile(r'^[^\S\n]*(?![{}"])(?!(?=.*score).*:)(\S.{19,}\S)[^\S\n]*$', re.MULTILINE)
+
 def parse_analysis_response(response_text):
     """Parse non-JSON response into structured format with better text extraction"""
     
-    # Try to extract meaningful content from the response
-    recommendations = []
-    
     # Look for common recommendation patterns in the text
-    lines = response_text.split('\n')
-    for line in lines:
-        line = line.strip()
-        if line and not line.startswith('{') and not line.startswith('}') and len(line) > 20:
-            # Skip JSON-like lines and very short lines
-            if not ('score' in line and ':' in line) and not line.startswith('"'):
-                recommendations.append(line)
+    recommendations = _RECOMMENDATION_LINE_RE.findall(response_text)
     
     # If we couldn't extract good recommendations, provide default ones
     if not recommendations:
@@ -381,79 +644,254 @@ def parse_analysis_response(response_text):
         "improvement_priority": ["Add more keywords", "Quantify achievements", "Improve formatting consistency"]
     }
 
+def build_improvement_prompt(section_content, suggestions, job_description=None):
+    """Build the Gemini prompt for improving a single resume section"""
+    # Create job-specific or general improvement prompt
+    if job_description and job_description.strip():
+        return f"""
+        You are an expert resume writer and ATS specialist. Improve the following resume section to better match the specific job requirements.
+
+        JOB DESCRIPTION:
+        {job_description}
+
+        ORIGINAL RESUME SECTION:
+        {section_content}
+
+        IMPROVEMENT SUGGESTIONS:
+        {', '.join(suggestions)}
+
+        Please provide an improved version that:
+        1. Implements all the suggestions with job-specific focus
+        2. Incorporates relevant keywords from the job description
+        3. Aligns experience/skills with job requirements
+        4. Uses terminology and phrases from the job posting
+        5. Highlights relevant achievements for this specific role
+        6. Maintains professional tone and ATS compatibility
+        7. Shows clear value proposition for this position
+
+        Focus on making this section highly relevant to the specific job requirements while maintaining authenticity.
+        Return only the improved content, nothing else.
+        """
+    return f"""
+        You are an expert resume writer and ATS specialist. Please improve the following resume section based on the suggestions provided.
+
+        Original Content:
+        {section_content}
+
+        Suggestions for improvement:
+        {', '.join(suggestions)}
+
+        Please provide an improved version that:
+        1. Implements all the suggestions
+        2. Maintains professional tone
+        3. Is ATS-friendly with relevant keywords
+        4. Uses strong action verbs and quantified achievements
+        5. Follows industry best practices
+        6. Is concise and impactful
+
+        Return only the improved content, nothing else.
+        """
+
+@st.cache_data(show_spinner=False, max_entries=64, ttl=3600)
+def _cached_improve(content_hash, jd_hash, suggestions, _response_text=None):
+    """Improved text for one section content + suggestions + job description hash.
+    
+    In memory with the same ttl as the analysis cache; fixes that outlive a restart are kept by save_fixes.
+    Looked up without a reply first, like _cached_analyze: a miss raises CacheMiss and the caller
+    streams Gemini's reply, then passes it in to be stored. Empty replies raise so they are never cached.
+    """
+    if _response_text is None:
+        raise CacheMiss(content_hash, jd_hash)
+    if isinstance(_response_text, str) and _response_text.strip():
+        return _response_text.strip()
+    raise RuntimeError("Could not generate improvements")
+
 def generate_improved_section(section_content, suggestions, job_description=None):
-    """Generate improved version of a resume section - Enhanced for job-specific optimization"""
+    """Generate improved version of a resume section - Enhanced for job-specific optimization; None on failure"""
     try:
         if not section_content or not suggestions:
             return section_content
         
+        content_hash = get_content_hash(section_content)
+        jd_hash = get_content_hash(job_description or '')
+        suggestions = list(suggestions)
+        try:
+            return _cached_improve(content_hash, jd_hash, suggestions)
+        except CacheMiss:
+            pass
+        
+        model = get_conversational_chain()
+        if not model:
+            raise RuntimeError("Could not create Gemini model")
+        
         is_job_specific = bool(job_description and job_description.strip())
         spinner_text = "🎯 Optimizing for this job..." if is_job_specific else "🔧 Improving section..."
         
+        # Stream the rewrite so its first lines show while Gemini is still generating
+        with st.spinner(spinner_text):
+            preview = st.empty()
+            response_text = preview.write_stream(
+                chunk.content
+                for chunk in model.stream(build_improvement_prompt(section_content, suggestions, job_description))
+                if chunk and hasattr(chunk, 'content') and chunk.content
+            )
+        preview.empty()
+        return _cached_improve(content_hash, jd_hash, suggestions, response_text)
+                
+    except Exception as e:
+        st.error(f"❌ Error generating improvements: {str(e)}")
+        return None
+
+def generate_improved_sections(sections, job_description=None):
+    """Generate improved versions of several resume sections with a single Gemini request.
+    
+    sections maps section_name -> (section_content, suggestions). Returns a dict of
+    section_name -> improved content for every section Gemini returned.
+    """
+    sections = {
+        name: (content, suggestions)
+        for name, (content, suggestions) in sections.items()
+        if content and suggestions
+    }
+    if not sections:
+        return {}
+    
+    try:
+        is_job_specific = bool(job_description and job_description.strip())
+        spinner_text = "🎯 Optimizing all sections for this job..." if is_job_specific else "🔧 Improving all sections..."
+        
         with st.spinner(spinner_text):
-            model = get_conversational_chain()
+            model = get_conversational_chain(json_mode=True)
             if not model:
-                return section_content
+                return {}
             
-            # Create job-specific or general improvement prompt
+            job_context = ""
             if is_job_specific:
-                improvement_prompt = f"""
-                You are an expert resume writer and ATS specialist. Improve the following resume section to better match the specific job requirements.
-
+                job_context = f"""
                 JOB DESCRIPTION:
                 {job_description}
 
-                ORIGINAL RESUME SECTION:
-                {section_content}
-
+                Tailor every section to this job: use its keywords and terminology, and highlight the most relevant achievements.
+                """
+            
+            section_blocks = "\n".join(
+                f"""
+                SECTION KEY: {name}
+                ORIGINAL CONTENT:
+                {content}
                 IMPROVEMENT SUGGESTIONS:
                 {', '.join(suggestions)}
-
-                Please provide an improved version that:
-                1. Implements all the suggestions with job-specific focus
-                2. Incorporates relevant keywords from the job description
-                3. Aligns experience/skills with job requirements
-                4. Uses terminology and phrases from the job posting
-                5. Highlights relevant achievements for this specific role
-                6. Maintains professional tone and ATS compatibility
-                7. Shows clear value proposition for this position
-
-                Focus on making this section highly relevant to the specific job requirements while maintaining authenticity.
-                Return only the improved content, nothing else.
                 """
-            else:
-                improvement_prompt = f"""
-                You are an expert resume writer and ATS specialist. Please improve the following resume section based on the suggestions provided.
-
-                Original Content:
-                {section_content}
-
-                Suggestions for improvement:
-                {', '.join(suggestions)}
+                for name, (content, suggestions) in sections.items()
+            )
+            
+            improvement_prompt = f"""
+                You are an expert resume writer and ATS specialist. Improve each of the following resume sections based on the suggestions provided.
+                {job_context}
+                {section_blocks}
 
-                Please provide an improved version that:
+                For every section, provide an improved version that:
                 1. Implements all the suggestions
-                2. Maintains professional tone
+                2. Maintains professional tone and authenticity
                 3. Is ATS-friendly with relevant keywords
                 4. Uses strong action verbs and quantified achievements
-                5. Follows industry best practices
-                6. Is concise and impactful
+                5. Is concise and impactful
 
-                Return only the improved content, nothing else.
+                Return a JSON object whose keys are exactly {', '.join(sections)} and whose values are the improved content strings.
                 """
             
-            # Use same response handling as before
+            improved = {}
             response = model.invoke(improvement_prompt)
             
             if response and hasattr(response, 'content'):
-                return response.content.strip()
-            else:
+                try:
+                    parsed = decode_json_response(response.content)
+                except json.JSONDecodeError:
+                    parsed = {}
+                if isinstance(parsed, dict):
+                    improved = {
+                        name: str(content).strip()
+                        for name, content in parsed.items()
+                        if name in sections and content
+                    }
+            
+            # Sections the batched reply dropped are retried as concurrent per-section calls
+            missing_sections = {name: item for name, item in sections.items() if name not in improved}
+            if missing_sections:
+                text_model = get_conversational_chain()
+                if text_model:
+                    retried, errors = improve_sections_concurrently(text_model, missing_sections, job_description)
+                    improved.update(retried)
+                    for name, error in errors.items():
+                        st.warning(f"⚠️ Could not improve {name.replace('_', ' ').title()}: {error}")
+            
+            if not improved:
                 st.error("❌ Could not generate improvements")
-                return section_content
-                
+            return improved
+    
     except Exception as e:
         st.error(f"❌ Error generating improvements: {str(e)}")
-        return section_content
+        return {}
+
+# Upper bound on parallel per-section Gemini calls
+MAX_IMPROVE_WORKERS = 8
+
+def _improve_one_section(model, section_content, suggestions, job_description=None):
+    """One blocking improvement call; raises on an empty reply"""
+    response = model.invoke(build_improvement_prompt(section_content, suggestions, job_description))
+    content = getattr(response, 'content', None)
+    if not content or not content.strip():
+        raise RuntimeError("empty reply")
+    return content.strip()
+
+def improve_sections_concurrently(model, sections, job_description=None):
+    """Improve several sections in parallel so total latency tracks the slowest call, not the sum.
+    
+    Uses threads with the blocking client - the shared cached model's async client is bound to the
+    first event loop, so repeated asyncio.run calls would fail. Returns (improved, errors) dicts
+    keyed by section name.
+    """
+    improved = {}
+    errors = {}
+    with ThreadPoolExecutor(max_workers=min(len(sections), MAX_IMPROVE_WORKERS)) as pool:
+        futures = {
+            name: pool.submit(_improve_one_section, model, content, suggestions, job_description)
+            for name, (content, suggestions) in sections.items()
+        }
+        for name, future in futures.items():
+            try:
+                improved[name] = future.result()
+            except Exception as e:
+                errors[name] = e
+    return improved, errors
+
+def find_replacement_spans(text, replacements):
+    """Return sorted (start, end, replacement) spans for the first occurrence of each original string"""
+    if ahocorasick is None or len(replacements) < 2:
+        spans = []
+        for original, replacement in replacements:
+            start = text.find(original)
+            if start != -1:
+                spans.append((start, start + len(original), replacement))
+        return sorted(spans, key=lambda span: span[0])
+    
+    # One scan of the text matches every original section at once; add_word overwrites the payload
+    # of a repeated word, so sections sharing the same original text share one (index, replacement) list
+    payloads = {}
+    for index, (original, replacement) in enumerate(replacements):
+        payloads.setdefault(original, []).append((index, replacement))
+    automaton = ahocorasick.Automaton()
+    for original, entries in payloads.items():
+        automaton.add_word(original, (len(original), entries))
+    automaton.make_automaton()
+    
+    first_matches = {}
+    for end_index, (length, entries) in automaton.iter(text):
+        for index, replacement in entries:
+            if index not in first_matches:
+                first_matches[index] = (end_index - length + 1, end_index + 1, replacement)
+    # Ties on start keep replacement order, as the str.find path does
+    return [first_matches[index] for index in sorted(first_matches, key=lambda index: (first_matches[index][0], index))]
 
 def generate_complete_resume():
     """Generate complete improved resume - Same pattern as session state handling in DOC-GPT"""
@@ -461,16 +899,391 @@ def generate_complete_resume():
         return "No resume text available"
     
     # Start with original resume
-    improved_resume = st.session_state.resume_text
+    original_resume = st.session_state.resume_text
+    if not st.session_state.analysis_results:
+        return original_resume
     
-    # Replace improved sections
+    # Locate every improved section in the original text, then rebuild it in one pass
+    sections = st.session_state.analysis_results.get('sections_analysis', {})
+    replacements = []
     for section_name, improved_content in st.session_state.improved_sections.items():
-        if st.session_state.analysis_results:
-            original_content = st.session_state.analysis_results.get('sections_analysis', {}).get(section_name, {}).get('content', '')
-            if original_content and original_content in improved_resume:
-                improved_resume = improved_resume.replace(original_content, improved_content)
-    
-    return improved_resume
+        original_content = sections.get(section_name, {}).get('content', '')
+        if original_content:
+            replacements.append((original_content, improved_content))
+    spans = find_replacement_spans(original_resume, replacements)
+    
+    parts = []
+    position = 0
+    for start, end, improved_content in spans:
+        if start < position:
+            # Overlaps a section that was already replaced
+            continue
+        parts.append(original_resume[position:start])
+        parts.append(improved_content)
+        position = end
+    parts.append(original_resume[position:])
+    
+    return "".join(parts)
+
+# Improved sections per resume + job description, so a reload or restart does not need new Gemini calls.
+# These files hold resume text; set RESUMEGPT_CACHE_DIR to move them, files expire with the analysis cache ttl.
+SAVED_FIXES_DIR = Path(os.getenv("RESUMEGPT_CACHE_DIR") or Path.home() / ".resumegpt_cache")
+SAVED_FIXES_MAX_AGE = 3600  # seconds, same as the analysis cache ttl
+
+def _saved_fixes_path(analysis_hash):
+    """JSON file holding the improved sections for one analysis hash"""
+    return SAVED_FIXES_DIR / f"{analysis_hash.replace(':', '_')}.json"
+
+def load_saved_fixes(analysis_hash):
+    """Improved sections saved for this analysis, or {} when there are none or the file is unreadable"""
+    if not analysis_hash:
+        return {}
+    prune_saved_fixes()
+    path = _saved_fixes_path(analysis_hash)
+    try:
+        if time.time() - path.stat().st_mtime > SAVED_FIXES_MAX_AGE:
+            return {}
+        saved = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return {str(name): str(content) for name, content in saved.items()} if isinstance(saved, dict) else {}
+
+def prune_saved_fixes():
+    """Delete saved fixes older than SAVED_FIXES_MAX_AGE; best effort, errors are ignored"""
+    cutoff = time.time() - SAVED_FIXES_MAX_AGE
+    try:
+        for path in SAVED_FIXES_DIR.glob("*.json"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                pass
+    except OSError:
+        pass
+
+def save_fixes():
+    """Write the current improved sections for the analysis on screen; best effort, errors are ignored"""
+    analysis_hash = st.session_state.last_analyzed_hash
+    if not analysis_hash:
+        return
+    prune_saved_fixes()
+    try:
+        SAVED_FIXES_DIR.mkdir(parents=True, exist_ok=True)
+        _saved_fixes_path(analysis_hash).write_text(json.dumps(st.session_state.improved_sections), encoding="utf-8")
+    except OSError:
+        pass
+
+def clear_saved_fixes():
+    """Delete the saved improved sections for the analysis on screen; best effort, errors are ignored"""
+    analysis_hash = st.session_state.last_analyzed_hash
+    if not analysis_hash:
+        return
+    try:
+        _saved_fixes_path(analysis_hash).unlink(missing_ok=True)
+    except OSError:
+        pass
+
+@st.cache_data(show_spinner=False, max_entries=16, ttl=3600)
+def _zip_improved_sections(sections_key, _improved_sections):
+    """Every improved section as <name>_improved.txt in one ZIP, rebuilt only when a section changes"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for section_name, improved_content in _improved_sections.items():
+            archive.writestr(f"{section_name}_improved.txt", improved_content)
+    return buffer.getvalue()
+
+def improved_sections_zip():
+    """ZIP bytes for the current improved sections, cached on (name, content hash) pairs"""
+    improved_sections = st.session_state.improved_sections
+    sections_key = tuple((name, get_content_hash(content)) for name, content in improved_sections.items())
+    return _zip_improved_sections(sections_key, improved_sections)
+
+# Static page HTML - built once at import, each grid is emitted with a single st.markdown call
+FEATURE_GRID_HTML = '''
+<div style="display: grid; grid-template-columns: repeat(4, 1fr); gap: 1rem;">
+    <div class="info-box" style="min-height: 120px; display: flex; flex-direction: column; justify-content: center;">
+        <div style="font-size: 1.5rem; margin-bottom: 0.5rem;">🎯</div>
+        <b>ATS Optimize</b><br>
+        <small>Beat applicant tracking systems with targeted optimization</small>
+    </div>
+    <div class="info-box" style="min-height: 120px; display: flex; flex-direction: column; justify-content: center;">
+        <div style="font-size: 1.5rem; margin-bottom: 0.5rem;">📊</div>
+        <b>Smart Analysis</b><br>
+        <small>AI-powered resume evaluation and scoring</small>
+    </div>
+    <div class="info-box" style="min-height: 120px; display: flex; flex-direction: column; justify-content: center;">
+        <div style="font-size: 1.5rem; margin-bottom: 0.5rem;">🔧</div>
+        <b>Auto-Fix</b><br>
+        <small>One-click resume improvements and optimization</small>
+    </div>
+    <div class="info-box" style="min-height: 120px; display: flex; flex-direction: column; justify-content: center;">
+        <div style="font-size: 1.5rem; margin-bottom: 0.5rem;">⚡</div>
+        <b>Instant Results</b><br>
+        <small>Real-time feedback and actionable insights</small>
+    </div>
+</div>
+'''
+
+SHOWCASE_GRID_HTML = '''
+<div style="display: grid; grid-template-columns: repeat(3, 1fr); gap: 0 1rem;">
+    <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
+                padding: 1.5rem; border-radius: 16px; color: white; 
+                box-shadow: 0 8px 25px rgba(102, 126, 234, 0.3); 
+                margin-bottom: 1rem; text-align: center; min-height: 140px; display: flex; flex-direction: column; justify-content: center;">
+        <div style="font-size: 2.5rem; margin-bottom: 0.5rem;">🎯</div>
+        <h4 style="margin: 0 0 0.5rem 0; color: white;">Job Match Score</h4>
+        <p style="margin: 0; font-size: 0.9rem; opacity: 0.9;">How well your resume fits the specific role</p>
+    </div>
+    <div style="background: linear-gradient(135deg, #ed8936 0%, #dd6b20 100%); 
+                padding: 1.5rem; border-radius: 16px; color: white; 
+                box-shadow: 0 8px 25px rgba(237, 137, 54, 0.3); 
+                margin-bottom: 1rem; text-align: center; min-height: 140px; display: flex; flex-direction: column; justify-content: center;">
+        <div style="font-size: 2.5rem; margin-bottom: 0.5rem;">📊</div>
+        <h4 style="margin: 0 0 0.5rem 0; color: white;">Requirements Coverage</h4>
+        <p style="margin: 0; font-size: 0.9rem; opacity: 0.9;">Percentage of job requirements you meet</p>
+    </div>
+    <div style="background: linear-gradient(135deg, #38b2ac 0%, #319795 100%); 
+                padding: 1.5rem; border-radius: 16px; color: white; 
+                box-shadow: 0 8px 25px rgba(56, 178, 172, 0.3); 
+                margin-bottom: 1rem; text-align: center; min-height: 140px; display: flex; flex-direction: column; justify-content: center;">
+        <div style="font-size: 2.5rem; margin-bottom: 0.5rem;">🔍</div>
+        <h4 style="margin: 0 0 0.5rem 0; color: white;">Job-Specific Keywords</h4>
+        <p style="margin: 0; font-size: 0.9rem; opacity: 0.9;">Keywords from the actual job posting</p>
+    </div>
+    <div style="background: linear-gradient(135deg, #48bb78 0%, #38a169 100%); 
+                padding: 1.5rem; border-radius: 16px; color: white; 
+                box-shadow: 0 8px 25px rgba(72, 187, 120, 0.3); 
+                margin-bottom: 1rem; text-align: center; min-height: 140px; display: flex; flex-direction: column; justify-content: center;">
+        <div style="font-size: 2.5rem; margin-bottom: 0.5rem;">💡</div>
+        <h4 style="margin: 0 0 0.5rem 0; color: white;">Targeted Suggestions</h4>
+        <p style="margin: 0; font-size: 0.9rem; opacity: 0.9;">Recommendations specific to this job</p>
+    </div>
+    <div style="background: linear-gradient(135deg, #9f7aea 0%, #805ad5 100%); 
+                padding: 1.5rem; border-radius: 16px; color: white; 
+                box-shadow: 0 8px 25px rgba(159, 122, 234, 0.3); 
+                margin-bottom: 1rem; text-align: center; min-height: 140px; display: flex; flex-direction: column; justify-content: center;">
+        <div style="font-size: 2.5rem; margin-bottom: 0.5rem;">🔧</div>
+        <h4 style="margin: 0 0 0.5rem 0; color: white;">Role Optimization</h4>
+        <p style="margin: 0; font-size: 0.9rem; opacity: 0.9;">Tailor your resume for this position</p>
+    </div>
+    <div style="background: linear-gradient(135deg, #f56565 0%, #e53e3e 100%); 
+                padding: 1.5rem; border-radius: 16px; color: white; 
+                box-shadow: 0 8px 25px rgba(245, 101, 101, 0.3); 
+                margin-bottom: 1rem; text-align: center; min-height: 140px; display: flex; flex-direction: column; justify-content: center;">
+        <div style="font-size: 2.5rem; margin-bottom: 0.5rem;">⚠️</div>
+        <h4 style="margin: 0 0 0.5rem 0; color: white;">Qualification Gaps</h4>
+        <p style="margin: 0; font-size: 0.9rem; opacity: 0.9;">Missing requirements to address</p>
+    </div>
+</div>
+'''
+
+CTA_HTML = """
+<div style="background: linear-gradient(135deg, #f7fafc 0%, #edf2f7 100%); 
+            padding: 2rem; border-radius: 16px; text-align: center; 
+            margin: 1rem 0 2rem 0; border: 2px solid #e2e8f0;">
+    <h3 style="color: #2d3748; margin-bottom: 1rem;">🚀 Ready to Optimize Your Resume?</h3>
+    <p style="color: #718096; margin-bottom: 1.5rem; font-size: 1.1rem;">
+        Upload your resume and job description in the sidebar to get started with AI-powered analysis!
+    </p>
+    <div style="display: flex; justify-content: center; gap: 1rem; flex-wrap: wrap;">
+        <span style="background: #667eea; color: white; padding: 0.5rem 1rem; border-radius: 20px; font-size: 0.9rem;">📄 Upload Resume</span>
+        <span style="background: #48bb78; color: white; padding: 0.5rem 1rem; border-radius: 20px; font-size: 0.9rem;">📋 Add Job Description</span>
+        <span style="background: #ed8936; color: white; padding: 0.5rem 1rem; border-radius: 20px; font-size: 0.9rem;">🎯 Get Analysis</span>
+    </div>
+</div>
+"""
+
+SHOWCASE_TITLE_HTML = '<h3 style="text-align: center; color: #2d3748; margin: 2rem 0 1.5rem 0; font-weight: 600;">What You\'ll Get with Job-Specific Analysis</h3>'
+
+RESPONSE_TITLE_TMPL = """
+<div style="color: #667eea; font-size: 1.8rem; font-weight: bold; margin-bottom: 1rem; text-align: center; border-bottom: 2px solid #667eea; padding-bottom: 0.5rem;">
+    {title}
+</div>
+"""
+
+
+JOB_COMPATIBILITY_BANNER_HTML = """
+<div class="banner banner-purple">
+    <h4>📊 Job Compatibility Analysis</h4>
+    <p>Your match with this specific position</p>
+</div>
+"""
+
+AREAS_TO_DEVELOP_HTML = """
+<div class="panel-header panel-red">
+    <div class="panel-icon">🎯</div>
+    <h4>Areas to Develop</h4>
+    <p>Focus on these for better job match</p>
+</div>
+"""
+
+# Per-item row templates use %-formatting - they are filled once per list entry
+GAP_ITEM_TMPL = '<div class="list-item list-item-red"><span class="list-item-icon">📍</span><span>%s</span></div>'
+
+COMPETITIVE_EDGE_HTML = """
+<div class="panel-header panel-green">
+    <div class="panel-icon">💪</div>
+    <h4>Your Competitive Edge</h4>
+    <p>Strengths that match this role</p>
+</div>
+"""
+
+STRENGTH_ITEM_TMPL = '<div class="list-item list-item-green"><span class="list-item-icon">⭐</span><span>%s</span></div>'
+
+KEYWORDS_OVERVIEW_BANNER_HTML = """
+<div class="banner banner-teal">
+    <h3>🏷️ Keywords Analysis Overview</h3>
+    <p>Your resume's keyword performance</p>
+</div>
+"""
+
+FOUND_KEYWORDS_CARD_TMPL = """
+<div class="count-card count-found">
+    <div class="count-card-icon">✅</div>
+    <h4>Found Keywords</h4>
+    <div class="count-card-value">{count}</div>
+</div>
+"""
+
+FOUND_KEYWORD_CHIP_TMPL = '<div class="chip chip-found">✅ %s</div>'
+
+MISSING_KEYWORDS_CARD_TMPL = """
+<div class="count-card count-missing">
+    <div class="count-card-icon">❌</div>
+    <h4>Missing Keywords</h4>
+    <div class="count-card-value">{count}</div>
+</div>
+"""
+
+MISSING_KEYWORD_CHIP_TMPL = '<div class="chip chip-missing">❌ %s</div>'
+
+JOB_SKILLS_BANNER_HTML = """
+<div class="banner banner-sunset">
+    <h4>🎯 Job-Specific Skills Analysis</h4>
+    <p>Required skills evaluation for this position</p>
+</div>
+"""
+
+REQUIRED_SKILLS_FOUND_HTML = """
+<div class="panel-header panel-green">
+    <div class="panel-icon">🎉</div>
+    <h4>Required Skills You Have</h4>
+    <p>Great job matching the requirements!</p>
+</div>
+"""
+
+REQUIRED_SKILL_FOUND_TMPL = '<div class="list-item list-item-compact list-item-green"><span class="list-item-icon">🎯</span><span>%s</span></div>'
+
+REQUIRED_SKILLS_MISSING_HTML = """
+<div class="panel-header panel-red">
+    <div class="panel-icon">⚠️</div>
+    <h4>Missing Required Skills</h4>
+    <p>Priority areas for improvement</p>
+</div>
+"""
+
+REQUIRED_SKILL_MISSING_TMPL = '<div class="list-item list-item-compact list-item-red"><span class="list-item-icon">🚨</span><span>%s</span></div>'
+
+SECTION_ANALYSIS_BANNER_HTML = """
+<div class="banner banner-pastel">
+    <h3>📋 Section-wise Analysis</h3>
+    <p>Detailed breakdown of each resume section</p>
+</div>
+"""
+
+# Section card template starts and ends on its tags so joined cards stay one HTML block
+SECTION_CARD_TMPL = """<div class="section-card">{badge}
+    <div class="section-card-row">
+        <div class="section-card-title">
+            <span class="section-card-icon">{icon}</span>
+            <h4>{section_title}</h4>
+        </div>
+        <span class="section-card-hint">Details below ▼</span>
+    </div>
+</div>"""
+
+SECTION_SCORE_BADGE_TMPL = '<div class="section-card-score"><span class="score-badge" style="background: %s;">%s%%</span></div>'
+
+SECTION_GRID_TMPL = '<div class="section-grid">%s</div>'
+
+# Section card icons - includes the section names used by the analysis response schema
+SECTION_ICONS = {
+    'summary': '📝',
+    'professional_summary': '📝',
+    'experience': '💼',
+    'work_experience': '💼',
+    'skills': '🔧',
+    'education': '🎓',
+    'projects': '🚀',
+    'certifications': '📜',
+    'contact': '📞',
+    'contact_info': '📞',
+    'formatting': '🎨'
+}
+
+NO_SECTION_ANALYSIS_HTML = """
+<div class="empty-state">
+    <div class="empty-state-icon">📋</div>
+    <p>No detailed section analysis available</p>
+</div>
+"""
+
+# Only the score band color stays inline; layout lives in styles.css
+SCORE_CARD_TMPL = '<div class="score-card" style="border-color: {color};"><div class="score-card-value" style="color: {color};">{score}%</div><div class="score-card-label">{label}</div></div>'
+
+SCORE_GRID_TMPL = '<div class="score-grid">%s</div>'
+
+ATS_SCORE_HERO_TMPL = '<div class="score-hero"><div class="score-hero-value" style="color: {color};">{score}%</div><div class="score-hero-label">ATS Compatibility Score</div></div>'
+
+SECTION_FIELD_TMPL = '<div class="section-field" style="background: {bg}; border-left-color: {accent};"><strong style="color: {accent};">{label}:</strong><br><span>{text}</span></div>'
+
+ANALYSIS_COMPLETE_HTML = """
+<div style="text-align: center; padding: 1rem; color: #48bb78;">
+    <span style="font-size: 1.2rem;">✅</span><br>
+    <em>Analysis completed successfully</em>
+</div>
+"""
+
+# Single improved-section view
+IMPROVED_TITLE_TMPL = """
+<div style="color: #48bb78; font-size: 1.8rem; font-weight: bold; margin-bottom: 1rem; text-align: center; border-bottom: 2px solid #48bb78; padding-bottom: 0.5rem;">
+    ✅ {title}
+</div>
+"""
+
+IMPROVED_CONTENT_CARD_HTML = """
+<div class="success-card">
+    <h4>📝 Improved Content</h4>
+</div>
+"""
+
+# Suggestions view - repeated cards, filled per item; styling lives in styles.css
+RECOMMENDATION_CARD_TMPL = '<div class="numbered-card numbered-card-blue"><div class="numbered-card-head"><span class="numbered-card-badge">{number}</span><strong>Priority Recommendation</strong></div><p>{text}</p></div>'
+
+QUALIFICATION_CARD_TMPL = '<div class="list-item list-item-{variant}"><span class="list-item-icon">{icon}</span><span>{text}</span></div>'
+
+KEYWORD_PILL_TMPL = '<div class="pill pill-{variant}">{icon} {text}</div>'
+
+KEYWORD_PILL_ROW_TMPL = '<div class="pill-row">%s</div>'
+
+SUGGESTION_ITEM_TMPL = '<div class="suggestion-item category-{slug}"><span class="suggestion-bullet">•</span><span>{text}</span></div>'
+
+PRIORITY_ACTION_TMPL = '<div class="numbered-card numbered-card-pink"><div class="numbered-card-head"><span class="numbered-card-badge">{number}</span><strong>High Priority Action</strong></div><p>{text}</p></div>'
+
+# Suggestion category -> tab icon; accent colors come from the .category-* classes
+SUGGESTION_CATEGORY_ICONS = {
+    'Skills': '🔧',
+    'Content': '📝',
+    'Experience': '💼',
+    'Formatting': '🎨',
+    'General': '💡'
+}
+
+@st.cache_resource
+def load_css():
+    """Load the app stylesheet once per server process, wrapped in its <style> tag"""
+    css = (Path(__file__).parent / "styles.css").read_text(encoding="utf-8")
+    return f"<style>{css}</style>"
 
 # Main application
 def main():
@@ -478,353 +1291,183 @@ def main():
     # Configure AI at the start
     configure_ai()
     
-    # CSS styling - Enhanced professional design
-    st.markdown("""
-    <style>
-    /* Import Google Fonts */
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-    
-    /* Global Styles */
-    html, body, [class*="css"] {
-        font-family: 'Inter', sans-serif;
-    }
+    # CSS styling - Enhanced professional design (the <style> block is built once per process)
+    st.markdown(load_css(), unsafe_allow_html=True)
+    
+    # Initialize session state - defaults are rebuilt each run so mutable ones are never shared
+    for key, default in (
+        ('analysis_results', None),
+        ('analysis_colors', {}),
+        ('analysis_views', {}),
+        ('is_job_specific', False),
+        ('resume_text', None),
+        ('job_description', None),
+        ('improved_sections', {}),
+        ('response_content', None),
+        ('response_type', None),
+        ('response_title', None),
+        ('fixed_sections', set()),
+        ('fixing_section', None),
+        ('editing_sections', set()),
+        ('last_analyzed_hash', None),
+        ('analysis_fallback', False),
+        ('resume_file', None),
+        ('jd_file', None),
+        ('resume_preview_text', None),
+        ('jd_preview_text', None),
+    ):
+        st.session_state.setdefault(key, default)
     
-    /* Hide Streamlit default elements */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    .stDeployButton {display:none;}
-    
-    /* Main Header */
-    .main-header {
-        text-align: center;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 50%, #f093fb 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        font-size: 3.5rem;
-        font-weight: 700;
-        margin: 0;
-        padding: 1rem 0;
-        letter-spacing: -0.02em;
-    }
+    # Enhanced Header with better visual hierarchy
+    st.markdown('<h1 class="main-header">AI-Powered ATS Resume Checker</h1>', unsafe_allow_html=True)
+    st.markdown('<p class="sub-header">Intelligent Resume Optimization with Advanced AI Analysis</p>', unsafe_allow_html=True)
+    st.markdown('<p class="tagline">Transform Your Resume for ATS Success • Beat Applicant Tracking Systems • Land Your Dream Job</p>', unsafe_allow_html=True)
     
-    .sub-header {
-        text-align: center;
-        color: #4a5568;
-        font-size: 1.3rem;
-        font-weight: 500;
-        margin: 0.5rem 0;
-    }
+    # st.markdown("---")
     
-    .tagline {
-        text-align: center;
-        color: #718096;
-        font-size: 1rem;
-        font-weight: 400;
-        margin-bottom: 2.5rem;
-        line-height: 1.6;
-    }
+    # Feature buttons and the active response panel rerun on their own
+    response_panel()
     
-    /* Sidebar Styling */
-    .sidebar-header {
-        color: #2d3748;
-        font-size: 1.4rem;
-        font-weight: 600;
-        margin-bottom: 1.5rem;
-        padding: 0.5rem 0;
-        border-bottom: 2px solid #e2e8f0;
-    }
+    # Sidebar for upload and analysis - a fragment, so its widgets don't rerun the result view
+    with st.sidebar:
+        sidebar_panel()
+
+@st.fragment
+def sidebar_panel():
+    """Upload and analyze controls, rerun independently of the main panel"""
+    # st.markdown('<h2 class="sidebar-header">📄 Upload Documents</h2>', unsafe_allow_html=True)
+    
+    # Step 1: Resume Upload
+    st.markdown("### 1️⃣ Upload Your Resume")
+    uploaded_file = st.file_uploader(
+        "Choose Resume File",
+        type=['pdf', 'docx'],
+        help="Upload your resume in PDF or DOCX format",
+        key="resume_upload"
+    )
     
-    /* Enhanced Button Styling */
-    .stButton > button {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border: none;
-        border-radius: 12px;
-        padding: 0.75rem 1.5rem;
-        font-weight: 600;
-        font-size: 0.95rem;
-        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-        box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1), 0 2px 4px -1px rgba(0, 0, 0, 0.06);
-        width: 100%;
-    }
+    if uploaded_file is not None:
+        st.success(f"✅ Resume uploaded: {uploaded_file.name}")
+        
+        # Keep the raw upload - text is extracted when analysis runs, so swapping files is free
+        file_data = get_upload_data(uploaded_file)
+        if not st.session_state.resume_file or st.session_state.resume_file[0] != file_data[0]:
+            st.session_state.update(resume_file=file_data, resume_text=None, resume_preview_text=None)
+        
+        # Show preview once the resume has been extracted
+        if st.session_state.resume_preview_text:
+            with st.expander("📋 Resume Text Preview"):
+                st.text_area("Extracted Text", st.session_state.resume_preview_text, height=150, disabled=True, key="resume_preview")
+    else:
+        st.info("📤 Upload your resume to get started")
     
-    .stButton > button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 10px 15px -3px rgba(0, 0, 0, 0.1), 0 4px 6px -2px rgba(0, 0, 0, 0.05);
-        background: linear-gradient(135deg, #5a6fd8 0%, #6b5b95 100%);
-    }
+    st.markdown("---")
     
-    .stButton > button:active {
-        transform: translateY(0);
-    }
+    # Step 2: Job Description Upload
+    st.markdown("### 2️⃣ Upload Job Description")
+    jd_option = st.radio(
+        "How do you want to provide the job description?",
+        ["Upload File (PDF/DOCX)", "Paste Text"],
+        help="Choose your preferred method to provide the job description"
+    )
     
-    /* Card Components */
-    .info-box {
-        background: linear-gradient(135deg, #f7fafc 0%, #edf2f7 100%);
-        padding: 1.5rem;
-        border-radius: 16px;
-        margin: 1rem 0;
-        border-left: 4px solid #667eea;
-        box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
-        transition: transform 0.2s ease-in-out;
-    }
-    
-    .info-box:hover {
-        transform: translateY(-2px);
-    }
-    
-    .analysis-card {
-        background: white;
-        padding: 2rem;
-        border-radius: 16px;
-        box-shadow: 0 10px 15px -3px rgba(0, 0, 0, 0.1), 0 4px 6px -2px rgba(0, 0, 0, 0.05);
-        margin-bottom: 1.5rem;
-        border: 1px solid #e2e8f0;
-        border-left: 4px solid #667eea;
-    }
-    
-    .improvement-card {
-        background: linear-gradient(135deg, #fef5e7 0%, #fed7aa 100%);
-        padding: 1.5rem;
-        border-radius: 12px;
-        border-left: 4px solid #f56565;
-        margin-bottom: 1rem;
-        box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
-    }
-    
-    .success-card {
-        background: linear-gradient(135deg, #f0fff4 0%, #c6f6d5 100%);
-        padding: 1.5rem;
-        border-radius: 12px;
-        border-left: 4px solid #48bb78;
-        margin-bottom: 1rem;
-        box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
-    }
-    
-    /* Enhanced Section States */
-    .fixed-section {
-        background: linear-gradient(135deg, #f0fff4 0%, #c6f6d5 50%);
-        padding: 1.5rem;
-        border-radius: 12px;
-        border: 2px solid #48bb78;
-        margin: 0.5rem 0;
-        box-shadow: 0 4px 6px -1px rgba(72, 187, 120, 0.2);
-        animation: pulse-green 2s ease-in-out;
-    }
-    
-    .fixing-section {
-        background: linear-gradient(135deg, #fff5f5 0%, #fed7d7 50%);
-        padding: 1.5rem;
-        border-radius: 12px;
-        border: 2px solid #ed8936;
-        margin: 0.5rem 0;
-        animation: pulse-orange 1.5s ease-in-out infinite;
-    }
-    
-    /* Enhanced Animations */
-    @keyframes pulse-green {
-        0% { 
-            box-shadow: 0 0 0 0 rgba(72, 187, 120, 0.7);
-            transform: scale(1);
-        }
-        70% { 
-            box-shadow: 0 0 0 10px rgba(72, 187, 120, 0);
-            transform: scale(1.02);
-        }
-        100% { 
-            box-shadow: 0 0 0 0 rgba(72, 187, 120, 0);
-            transform: scale(1);
-        }
-    }
-    
-    @keyframes pulse-orange {
-        0% { opacity: 1; transform: scale(1); }
-        50% { opacity: 0.8; transform: scale(1.01); }
-        100% { opacity: 1; transform: scale(1); }
-    }
-    
-    /* Enhanced Metrics */
-    .metric-container {
-        background: linear-gradient(135deg, #ffffff 0%, #f8fafc 100%);
-        padding: 1.5rem;
-        border-radius: 12px;
-        text-align: center;
-        box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1), 0 2px 4px -1px rgba(0, 0, 0, 0.06);
-        border: 1px solid #e2e8f0;
-        transition: transform 0.2s ease-in-out;
-    }
-    
-    .metric-container:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 10px 15px -3px rgba(0, 0, 0, 0.1), 0 4px 6px -2px rgba(0, 0, 0, 0.05);
-    }
-    
-    .metric-value {
-        font-size: 2.5rem;
-        font-weight: 700;
-        color: #2d3748;
-        margin-bottom: 0.5rem;
-    }
-    
-    .metric-label {
-        font-size: 0.875rem;
-        color: #718096;
-        font-weight: 500;
-        text-transform: uppercase;
-        letter-spacing: 0.05em;
-    }
-    
-    /* File Upload Enhancement */
-    .stFileUploader > div > div {
-        background: linear-gradient(135deg, #f7fafc 0%, #edf2f7 100%);
-        border: 2px dashed #cbd5e0;
-        border-radius: 12px;
-        padding: 2rem;
-        transition: all 0.3s ease;
-    }
-    
-    .stFileUploader > div > div:hover {
-        border-color: #667eea;
-        background: linear-gradient(135deg, #edf2f7 0%, #e2e8f0 100%);
-    }
-    
-    /* Progress Indicators */
-    .stProgress > div > div {
-        background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-        border-radius: 10px;
-    }
-    
-    /* Enhanced Alerts */
-    .stAlert {
-        border-radius: 12px;
-        border: none;
-        box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
-    }
-    
-    /* Step Indicators */
-    .step-indicator {
-        display: flex;
-        align-items: center;
-        margin: 1rem 0;
-        padding: 1rem;
-        background: linear-gradient(135deg, #f7fafc 0%, #edf2f7 100%);
-        border-radius: 12px;
-        border-left: 4px solid #667eea;
-    }
-    
-    .step-number {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        width: 2rem;
-        height: 2rem;
-        border-radius: 50%;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        font-weight: 600;
-        margin-right: 1rem;
-    }
-    
-    /* Responsive Design */
-    @media (max-width: 768px) {
-        .main-header {
-            font-size: 2.5rem;
-        }
-        
-        .sub-header {
-            font-size: 1.1rem;
-        }
-        
-        .metric-value {
-            font-size: 2rem;
-        }
-    }
-    
-    /* Dark mode support */
-    @media (prefers-color-scheme: dark) {
-        .metric-container {
-            background: linear-gradient(135deg, #2d3748 0%, #4a5568 100%);
-            color: white;
-        }
-        
-        .metric-value {
-            color: white;
-        }
-    }
-    </style>
-    """, unsafe_allow_html=True)
-    
-    # Initialize session state - Same pattern as DOC-GPT
-    if 'analysis_results' not in st.session_state:
-        st.session_state.analysis_results = None
-    if 'resume_text' not in st.session_state:
-        st.session_state.resume_text = None
-    if 'job_description' not in st.session_state:
-        st.session_state.job_description = None
-    if 'improved_sections' not in st.session_state:
-        st.session_state.improved_sections = {}
-    if 'response_content' not in st.session_state:
-        st.session_state.response_content = None
-    if 'response_type' not in st.session_state:
-        st.session_state.response_type = None
-    if 'response_title' not in st.session_state:
-        st.session_state.response_title = None
-    if 'fixed_sections' not in st.session_state:
-        st.session_state.fixed_sections = set()
-    if 'fixing_section' not in st.session_state:
-        st.session_state.fixing_section = None
-    if 'last_analyzed_hash' not in st.session_state:
-        st.session_state.last_analyzed_hash = None
-    if 'analysis_cached' not in st.session_state:
-        st.session_state.analysis_cached = False
-    
-    # Enhanced Header with better visual hierarchy
-    st.markdown('<h1 class="main-header">AI-Powered ATS Resume Checker</h1>', unsafe_allow_html=True)
-    st.markdown('<p class="sub-header">Intelligent Resume Optimization with Advanced AI Analysis</p>', unsafe_allow_html=True)
-    st.markdown('<p class="tagline">Transform Your Resume for ATS Success • Beat Applicant Tracking Systems • Land Your Dream Job</p>', unsafe_allow_html=True)
-    
-    # Enhanced feature highlights with consistent sizing and better descriptions
-    col1, col2, col3, col4 = st.columns(4)
-    with col1:
-        st.markdown('''
-        <div class="info-box" style="min-height: 120px; display: flex; flex-direction: column; justify-content: center;">
-            <div style="font-size: 1.5rem; margin-bottom: 0.5rem;">🎯</div>
-            <b>ATS Optimize</b><br>
-            <small>Beat applicant tracking systems with targeted optimization</small>
-        </div>
-        ''', unsafe_allow_html=True)
-    with col2:
-        st.markdown('''
-        <div class="info-box" style="min-height: 120px; display: flex; flex-direction: column; justify-content: center;">
-            <div style="font-size: 1.5rem; margin-bottom: 0.5rem;">📊</div>
-            <b>Smart Analysis</b><br>
-            <small>AI-powered resume evaluation and scoring</small>
-        </div>
-        ''', unsafe_allow_html=True)
-    with col3:
-        st.markdown('''
-        <div class="info-box" style="min-height: 120px; display: flex; flex-direction: column; justify-content: center;">
-            <div style="font-size: 1.5rem; margin-bottom: 0.5rem;">🔧</div>
-            <b>Auto-Fix</b><br>
-            <small>One-click resume improvements and optimization</small>
-        </div>
-        ''', unsafe_allow_html=True)
-    with col4:
-        st.markdown('''
-        <div class="info-box" style="min-height: 120px; display: flex; flex-direction: column; justify-content: center;">
-            <div style="font-size: 1.5rem; margin-bottom: 0.5rem;">⚡</div>
-            <b>Instant Results</b><br>
-            <small>Real-time feedback and actionable insights</small>
-        </div>
-        ''', unsafe_allow_html=True)
+    if jd_option == "Upload File (PDF/DOCX)":
+        jd_file = st.file_uploader(
+            "Choose Job Description File",
+            type=['pdf', 'docx'],
+            help="Upload the job description in PDF or DOCX format",
+            key="jd_upload"
+        )
+        
+        if jd_file is not None:
+            st.success(f"✅ JD uploaded: {jd_file.name}")
+            
+            # Keep the raw upload - text is extracted when analysis runs
+            file_data = get_upload_data(jd_file)
+            if not st.session_state.jd_file or st.session_state.jd_file[0] != file_data[0]:
+                st.session_state.update(jd_file=file_data, job_description=None, jd_preview_text=None)
+            
+            # Show preview once the job description has been extracted
+            if st.session_state.jd_preview_text:
+                with st.expander("📋 Job Description Preview"):
+                    st.text_area("Extracted JD Text", st.session_state.jd_preview_text, height=150, disabled=True, key="jd_preview")
+    else:
+        # Text area for pasting JD
+        jd_text = st.text_area(
+            "Paste Job Description Here",
+            height=200,
+            placeholder="Paste the complete job description here...",
+            help="Copy and paste the job description text"
+        )
+        
+        if jd_text.strip():
+            st.session_state.update(job_description=jd_text.strip(), jd_file=None)
+            st.success("✅ Job description added!")
+        else:
+            st.info("📝 Paste the job description text above")
+    
+    st.markdown("---")
+    
+    # Step 3: Analyze Button
+    st.markdown("### 3️⃣ AI Analysis")
+    
+    # Check if both resume and JD are available
+    has_resume = bool(st.session_state.resume_text or st.session_state.resume_file)
+    has_job_description = bool(st.session_state.job_description or st.session_state.jd_file)
+    can_analyze = has_resume and has_job_description
+    
+    if can_analyze:
+        if st.button("🤖 Analyze Resume vs Job Requirements", use_container_width=True, type="primary") and extract_pending_uploads():
+            with st.spinner("🤖 Analyzing your resume against job requirements..."):
+                previous_hash = st.session_state.last_analyzed_hash
+                analysis = analyze_resume_with_gemini(st.session_state.resume_text, st.session_state.job_description)
+                if analysis:
+                    # Restore any fixes saved for this resume + job description in an earlier session
+                    improved_sections = load_saved_fixes(st.session_state.last_analyzed_hash)
+                    fixed_sections = set(improved_sections)
+                    if st.session_state.last_analyzed_hash == previous_hash:
+                        # Same resume + JD - this session's fixes win, even if saving them failed or they expired on disk
+                        improved_sections.update(st.session_state.improved_sections)
+                        fixed_sections |= st.session_state.fixed_sections
+                    st.session_state.update(
+                        analysis_results=analysis,
+                        improved_sections=improved_sections,
+                        fixed_sections=fixed_sections,
+                        fixing_section=None,
+                        editing_sections=set(),
+                        analysis_colors=get_score_colors(analysis),
+                        is_job_specific='job_match_score' in analysis,
+                        response_content="analysis_complete",
+                        response_type="analysis",
+                        response_title="Resume Analysis Results",
+                    )
+                    st.success("✅ Analysis complete! Use the buttons above to explore results →")
+                    st.rerun()
+    else:
+        st.info("📋 Upload both resume and job description to enable analysis")
+        missing_items = []
+        if not has_resume:
+            missing_items.append("• Resume")
+        if not has_job_description:
+            missing_items.append("• Job Description")
+        st.markdown("**Missing:**")
+        for item in missing_items:
+            st.markdown(item)
     
     # st.markdown("---")
-    
+    # st.markdown("**ℹ️ About**")
+    # st.markdown("**👨‍💻 Created by:**  Sahana")
+    # st.markdown("**🤖 AI Model:** Google Gemini 2.0 Flash")
+    # st.markdown("**🔒 Privacy:** Your documents are processed securely") 
+    # st.markdown("**💡 Tip:** Upload both resume and job description for accurate ATS matching!")
+
+@st.fragment
+def response_panel():
+    """Feature buttons and the selected response view, rerun independently of the page"""
     # Show AI-Powered Features buttons only after analysis is complete
     if st.session_state.analysis_results:
         # Check if this is job-specific analysis
-        is_job_specific = 'job_match_score' in st.session_state.analysis_results
+        is_job_specific = st.session_state.is_job_specific
         
         if is_job_specific:
             st.markdown("### 🎯 Job-Specific Analysis Features")
@@ -835,13 +1478,9 @@ def main():
         
         with col1:
             if st.button("📊 Analysis Overview", use_container_width=True):
-                st.session_state.response_content = "analysis_complete"
-                st.session_state.response_type = "analysis"
-                if is_job_specific:
-                    st.session_state.response_title = "🎯 Job-Specific Analysis Results"
-                else:
-                    st.session_state.response_title = "📊 Resume Analysis Results"
-                st.rerun()
+                title_text = "🎯 Job-Specific Analysis Results" if is_job_specific else "📊 Resume Analysis Results"
+                st.session_state.update(response_content="analysis_complete", response_type="analysis", response_title=title_text)
+                st.rerun(scope="fragment")
         
         with col2:
             if is_job_specific:
@@ -852,10 +1491,8 @@ def main():
                 title_text = "🔍 ATS Compatibility Score"
             
             if st.button(button_text, use_container_width=True):
-                st.session_state.response_content = "ats_score"
-                st.session_state.response_type = "score"
-                st.session_state.response_title = title_text
-                st.rerun()
+                st.session_state.update(response_content="ats_score", response_type="score", response_title=title_text)
+                st.rerun(scope="fragment")
         
         with col3:
             if is_job_specific:
@@ -866,1112 +1503,316 @@ def main():
                 title_text = "💡 Improvement Suggestions"
             
             if st.button(button_text, use_container_width=True):
-                st.session_state.response_content = "suggestions"
-                st.session_state.response_type = "suggestions"
-                st.session_state.response_title = title_text
-                st.rerun()
+                st.session_state.update(response_content="suggestions", response_type="suggestions", response_title=title_text)
+                st.rerun(scope="fragment")
         
         with col4:
             if is_job_specific:
                 button_text = "🔧 Optimize for Job"
                 title_text = "🔧 Job-Specific Optimization"
-            else:
-                button_text = "📝 Auto-Improve"
-                title_text = "📝 Auto-Improvement Options"
-            
-            if st.button(button_text, use_container_width=True):
-                st.session_state.response_content = "auto_improve"
-                st.session_state.response_type = "improve"
-                st.session_state.response_title = title_text
-                st.rerun()
-    
-        # st.markdown("---")
-    
-    if st.session_state.response_content:
-        display_response_content()
-    else:
-        # Call-to-action section moved to top for better user flow
-        st.markdown('''
-        <div style="background: linear-gradient(135deg, #f7fafc 0%, #edf2f7 100%); 
-                    padding: 2rem; border-radius: 16px; text-align: center; 
-                    margin: 1rem 0 2rem 0; border: 2px solid #e2e8f0;">
-            <h3 style="color: #2d3748; margin-bottom: 1rem;">🚀 Ready to Optimize Your Resume?</h3>
-            <p style="color: #718096; margin-bottom: 1.5rem; font-size: 1.1rem;">
-                Upload your resume and job description in the sidebar to get started with AI-powered analysis!
-            </p>
-            <div style="display: flex; justify-content: center; gap: 1rem; flex-wrap: wrap;">
-                <span style="background: #667eea; color: white; padding: 0.5rem 1rem; border-radius: 20px; font-size: 0.9rem;">📄 Upload Resume</span>
-                <span style="background: #48bb78; color: white; padding: 0.5rem 1rem; border-radius: 20px; font-size: 0.9rem;">📋 Add Job Description</span>
-                <span style="background: #ed8936; color: white; padding: 0.5rem 1rem; border-radius: 20px; font-size: 0.9rem;">🎯 Get Analysis</span>
-            </div>
-        </div>
-        ''', unsafe_allow_html=True)
-        
-        # Enhanced visual showcase of features - moved below call-to-action
-        st.markdown('<h3 style="text-align: center; color: #2d3748; margin: 2rem 0 1.5rem 0; font-weight: 600;">What You\'ll Get with Job-Specific Analysis</h3>', unsafe_allow_html=True)
-        
-        # Create visually appealing feature cards in a grid with consistent sizing
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.markdown('''
-            <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                        padding: 1.5rem; border-radius: 16px; color: white; 
-                        box-shadow: 0 8px 25px rgba(102, 126, 234, 0.3); 
-                        margin-bottom: 1rem; text-align: center; min-height: 140px; display: flex; flex-direction: column; justify-content: center;">
-                <div style="font-size: 2.5rem; margin-bottom: 0.5rem;">🎯</div>
-                <h4 style="margin: 0 0 0.5rem 0; color: white;">Job Match Score</h4>
-                <p style="margin: 0; font-size: 0.9rem; opacity: 0.9;">How well your resume fits the specific role</p>
-            </div>
-            ''', unsafe_allow_html=True)
-            
-            st.markdown('''
-            <div style="background: linear-gradient(135deg, #48bb78 0%, #38a169 100%); 
-                        padding: 1.5rem; border-radius: 16px; color: white; 
-                        box-shadow: 0 8px 25px rgba(72, 187, 120, 0.3); 
-                        margin-bottom: 1rem; text-align: center; min-height: 140px; display: flex; flex-direction: column; justify-content: center;">
-                <div style="font-size: 2.5rem; margin-bottom: 0.5rem;">💡</div>
-                <h4 style="margin: 0 0 0.5rem 0; color: white;">Targeted Suggestions</h4>
-                <p style="margin: 0; font-size: 0.9rem; opacity: 0.9;">Recommendations specific to this job</p>
-            </div>
-            ''', unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown('''
-            <div style="background: linear-gradient(135deg, #ed8936 0%, #dd6b20 100%); 
-                        padding: 1.5rem; border-radius: 16px; color: white; 
-                        box-shadow: 0 8px 25px rgba(237, 137, 54, 0.3); 
-                        margin-bottom: 1rem; text-align: center; min-height: 140px; display: flex; flex-direction: column; justify-content: center;">
-                <div style="font-size: 2.5rem; margin-bottom: 0.5rem;">📊</div>
-                <h4 style="margin: 0 0 0.5rem 0; color: white;">Requirements Coverage</h4>
-                <p style="margin: 0; font-size: 0.9rem; opacity: 0.9;">Percentage of job requirements you meet</p>
-            </div>
-            ''', unsafe_allow_html=True)
-            
-            st.markdown('''
-            <div style="background: linear-gradient(135deg, #9f7aea 0%, #805ad5 100%); 
-                        padding: 1.5rem; border-radius: 16px; color: white; 
-                        box-shadow: 0 8px 25px rgba(159, 122, 234, 0.3); 
-                        margin-bottom: 1rem; text-align: center; min-height: 140px; display: flex; flex-direction: column; justify-content: center;">
-                <div style="font-size: 2.5rem; margin-bottom: 0.5rem;">🔧</div>
-                <h4 style="margin: 0 0 0.5rem 0; color: white;">Role Optimization</h4>
-                <p style="margin: 0; font-size: 0.9rem; opacity: 0.9;">Tailor your resume for this position</p>
-            </div>
-            ''', unsafe_allow_html=True)
-        
-        with col3:
-            st.markdown('''
-            <div style="background: linear-gradient(135deg, #38b2ac 0%, #319795 100%); 
-                        padding: 1.5rem; border-radius: 16px; color: white; 
-                        box-shadow: 0 8px 25px rgba(56, 178, 172, 0.3); 
-                        margin-bottom: 1rem; text-align: center; min-height: 140px; display: flex; flex-direction: column; justify-content: center;">
-                <div style="font-size: 2.5rem; margin-bottom: 0.5rem;">🔍</div>
-                <h4 style="margin: 0 0 0.5rem 0; color: white;">Job-Specific Keywords</h4>
-                <p style="margin: 0; font-size: 0.9rem; opacity: 0.9;">Keywords from the actual job posting</p>
-            </div>
-            ''', unsafe_allow_html=True)
-            
-            st.markdown('''
-            <div style="background: linear-gradient(135deg, #f56565 0%, #e53e3e 100%); 
-                        padding: 1.5rem; border-radius: 16px; color: white; 
-                        box-shadow: 0 8px 25px rgba(245, 101, 101, 0.3); 
-                        margin-bottom: 1rem; text-align: center; min-height: 140px; display: flex; flex-direction: column; justify-content: center;">
-                <div style="font-size: 2.5rem; margin-bottom: 0.5rem;">⚠️</div>
-                <h4 style="margin: 0 0 0.5rem 0; color: white;">Qualification Gaps</h4>
-                <p style="margin: 0; font-size: 0.9rem; opacity: 0.9;">Missing requirements to address</p>
-            </div>
-            ''', unsafe_allow_html=True)
-    
-    # Sidebar for upload and analysis
-    with st.sidebar:
-        # st.markdown('<h2 class="sidebar-header">📄 Upload Documents</h2>', unsafe_allow_html=True)
-        
-        # Step 1: Resume Upload
-        st.markdown("### 1️⃣ Upload Your Resume")
-        uploaded_file = st.file_uploader(
-            "Choose Resume File",
-            type=['pdf', 'docx'],
-            help="Upload your resume in PDF or DOCX format",
-            key="resume_upload"
-        )
-        
-        if uploaded_file is not None:
-            st.success(f"✅ Resume uploaded: {uploaded_file.name}")
-            
-            # Extract text from uploaded file
-            with st.spinner("📖 Extracting text from your resume..."):
-                resume_text = extract_resume_text(uploaded_file)
-                
-            if resume_text:
-                st.session_state.resume_text = resume_text
-                
-                # Show preview
-                with st.expander("📋 Resume Text Preview"):
-                    st.text_area("Extracted Text", resume_text[:500] + "..." if len(resume_text) > 500 else resume_text, height=150, disabled=True, key="resume_preview")
-            else:
-                st.error("❌ Failed to extract text from the resume file.")
-        else:
-            st.info("📤 Upload your resume to get started")
-        
-        st.markdown("---")
-        
-        # Step 2: Job Description Upload
-        st.markdown("### 2️⃣ Upload Job Description")
-        jd_option = st.radio(
-            "How do you want to provide the job description?",
-            ["Upload File (PDF/DOCX)", "Paste Text"],
-            help="Choose your preferred method to provide the job description"
-        )
-        
-        if jd_option == "Upload File (PDF/DOCX)":
-            jd_file = st.file_uploader(
-                "Choose Job Description File",
-                type=['pdf', 'docx'],
-                help="Upload the job description in PDF or DOCX format",
-                key="jd_upload"
-            )
-            
-            if jd_file is not None:
-                st.success(f"✅ JD uploaded: {jd_file.name}")
-                
-                # Extract text from uploaded JD file
-                with st.spinner("📖 Extracting text from job description..."):
-                    jd_text = extract_resume_text(jd_file)  # Same function works for any text file
-                    
-                if jd_text:
-                    st.session_state.job_description = jd_text
-                    
-                    # Show preview
-                    with st.expander("📋 Job Description Preview"):
-                        st.text_area("Extracted JD Text", jd_text[:500] + "..." if len(jd_text) > 500 else jd_text, height=150, disabled=True, key="jd_preview")
-                else:
-                    st.error("❌ Failed to extract text from the JD file.")
-        else:
-            # Text area for pasting JD
-            jd_text = st.text_area(
-                "Paste Job Description Here",
-                height=200,
-                placeholder="Paste the complete job description here...",
-                help="Copy and paste the job description text"
-            )
-            
-            if jd_text.strip():
-                st.session_state.job_description = jd_text.strip()
-                st.success("✅ Job description added!")
-            else:
-                st.info("📝 Paste the job description text above")
-        
-        st.markdown("---")
-        
-        # Step 3: Analyze Button
-        st.markdown("### 3️⃣ AI Analysis")
-        
-        # Check if both resume and JD are available
-        can_analyze = bool(st.session_state.resume_text and st.session_state.job_description)
-        
-        if can_analyze:
-            if st.button("🤖 Analyze Resume vs Job Requirements", use_container_width=True, type="primary"):
-                with st.spinner("🤖 Analyzing your resume against job requirements..."):
-                    analysis = analyze_resume_with_gemini(st.session_state.resume_text, st.session_state.job_description)
-                    if analysis:
-                        st.session_state.analysis_results = analysis
-                        st.session_state.response_content = "analysis_complete"
-                        st.session_state.response_type = "analysis"
-                        st.session_state.response_title = "Resume Analysis Results"
-                        st.success("✅ Analysis complete! Use the buttons above to explore results →")
-                        st.rerun()
-        else:
-            st.info("📋 Upload both resume and job description to enable analysis")
-            missing_items = []
-            if not st.session_state.resume_text:
-                missing_items.append("• Resume")
-            if not st.session_state.job_description:
-                missing_items.append("• Job Description")
-            st.markdown("**Missing:**")
-            for item in missing_items:
-                st.markdown(item)
-        
-        # st.markdown("---")
-        # st.markdown("**ℹ️ About**")
-        # st.markdown("**👨‍💻 Created by:**  Sahana")
-        # st.markdown("**🤖 AI Model:** Google Gemini 2.0 Flash")
-        # st.markdown("**🔒 Privacy:** Your documents are processed securely") 
-        # st.markdown("**💡 Tip:** Upload both resume and job description for accurate ATS matching!")
-
-def display_response_content():
-    """Display response content based on type - Same pattern as DOC-GPT"""
-    if st.session_state.response_type == "analysis":
-        display_analysis_results()
-    elif st.session_state.response_type == "score":
-        display_ats_score()
-    elif st.session_state.response_type == "suggestions":
-        display_suggestions()
-    elif st.session_state.response_type == "improve":
-        display_auto_improve()
-    elif st.session_state.response_type == "improvement":
-        display_improved_section()
-    
-    # Clear response button
-    if st.button("✖️ Clear Results", key="clear_response"):
-        st.session_state.response_content = None
-        st.session_state.response_type = None
-        st.session_state.response_title = None
-        st.rerun()
-
-def display_analysis_results():
-    """Display analysis results"""
-    if not st.session_state.analysis_results:
-        return
-    
-    analysis = st.session_state.analysis_results
-    
-    st.markdown(f"""
-    <div style="color: #667eea; font-size: 1.8rem; font-weight: bold; margin-bottom: 1rem; text-align: center; border-bottom: 2px solid #667eea; padding-bottom: 0.5rem;">
-        {st.session_state.response_title}
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Check if this is a job-specific analysis
-    is_job_specific = 'job_match_score' in analysis
-    
-    if is_job_specific:
-        # Job-specific analysis - show 4 metrics
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            score = analysis.get('overall_score', 0)
-            color = get_score_color(score)
-            st.markdown(f"""
-            <div class="metric-container">
-                <div class="metric-value" style="color: {color}">{score}%</div>
-                <div class="metric-label">Overall Score</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            job_score = analysis.get('job_match_score', 0)
-            color = get_score_color(job_score)
-            st.markdown(f"""
-            <div class="metric-container">
-                <div class="metric-value" style="color: {color}">{job_score}%</div>
-                <div class="metric-label">Job Match</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col3:
-            ats_score = analysis.get('ats_compatibility', 0)
-            color = get_score_color(ats_score)
-            st.markdown(f"""
-            <div class="metric-container">
-                <div class="metric-value" style="color: {color}">{ats_score}%</div>
-                <div class="metric-label">ATS Compatibility</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col4:
-            format_score = analysis.get('formatting', {}).get('score', 0)
-            color = get_score_color(format_score)
-            st.markdown(f"""
-            <div class="metric-container">
-                <div class="metric-value" style="color: {color}">{format_score}%</div>
-                <div class="metric-label">Formatting</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        # Job-specific analysis section
-        if 'job_specific_analysis' in analysis:
-            st.markdown("### 🎯 Job-Specific Analysis")
-            job_analysis = analysis['job_specific_analysis']
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                req_match = job_analysis.get('requirements_match', 0)
-                color = get_score_color(req_match)
-                st.markdown(f"""
-                <div class="metric-container">
-                    <div class="metric-value" style="color: {color}">{req_match}%</div>
-                    <div class="metric-label">Requirements Met</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col2:
-                exp_rel = job_analysis.get('experience_relevance', 0)
-                color = get_score_color(exp_rel)
-                st.markdown(f"""
-                <div class="metric-container">
-                    <div class="metric-value" style="color: {color}">{exp_rel}%</div>
-                    <div class="metric-label">Experience Relevance</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Enhanced visualization for qualification gaps and strengths
-            qualification_gaps = job_analysis.get('qualification_gaps', [])
-            strength_alignment = job_analysis.get('strength_alignment', [])
-            
-            if qualification_gaps or strength_alignment:
-                st.markdown("""
-                <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                            padding: 1.5rem; border-radius: 16px; color: white; text-align: center; margin: 2rem 0 1rem 0;">
-                    <h4 style="color: white; margin: 0 0 0.5rem 0;">📊 Job Compatibility Analysis</h4>
-                    <p style="opacity: 0.9; margin: 0;">Your match with this specific position</p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    if qualification_gaps:
-                        st.markdown("""
-                        <div style="background: linear-gradient(135deg, #fed7d7 0%, #feb2b2 100%); 
-                                    padding: 1.5rem; border-radius: 16px; margin-bottom: 1rem;">
-                            <div style="text-align: center; margin-bottom: 1rem;">
-                                <div style="font-size: 2.5rem; margin-bottom: 0.5rem;">🎯</div>
-                                <h4 style="color: #c53030; margin: 0;">Areas to Develop</h4>
-                                <p style="color: #744210; margin: 0.5rem 0 0 0; font-size: 0.9rem;">Focus on these for better job match</p>
-                            </div>
-                        </div>
-                        """, unsafe_allow_html=True)
-                        
-                        for gap in qualification_gaps:
-                            st.markdown(f"""
-                            <div style="background: white; padding: 1rem; border-radius: 8px; 
-                                        margin-bottom: 0.5rem; border-left: 4px solid #f56565; 
-                                        box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
-                                <div style="display: flex; align-items: center;">
-                                    <span style="color: #f56565; margin-right: 0.5rem;">📍</span>
-                                    <span style="color: #2d3748; line-height: 1.4;">{gap}</span>
-                                </div>
-                            </div>
-                            """, unsafe_allow_html=True)
-                
-                with col2:
-                    if strength_alignment:
-                        st.markdown("""
-                        <div style="background: linear-gradient(135deg, #c6f6d5 0%, #9ae6b4 100%); 
-                                    padding: 1.5rem; border-radius: 16px; margin-bottom: 1rem;">
-                            <div style="text-align: center; margin-bottom: 1rem;">
-                                <div style="font-size: 2.5rem; margin-bottom: 0.5rem;">💪</div>
-                                <h4 style="color: #276749; margin: 0;">Your Competitive Edge</h4>
-                                <p style="color: #22543d; margin: 0.5rem 0 0 0; font-size: 0.9rem;">Strengths that match this role</p>
-                            </div>
-                        </div>
-                        """, unsafe_allow_html=True)
-                        
-                        for strength in strength_alignment:
-                            st.markdown(f"""
-                            <div style="background: white; padding: 1rem; border-radius: 8px; 
-                                        margin-bottom: 0.5rem; border-left: 4px solid #48bb78; 
-                                        box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
-                                <div style="display: flex; align-items: center;">
-                                    <span style="color: #48bb78; margin-right: 0.5rem;">⭐</span>
-                                    <span style="color: #2d3748; line-height: 1.4;">{strength}</span>
-                                </div>
-                            </div>
-                            """, unsafe_allow_html=True)
-        
-    else:
-        # General analysis - show 3 metrics
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            score = analysis.get('overall_score', 0)
-            color = get_score_color(score)
-            st.markdown(f"""
-            <div class="metric-container">
-                <div class="metric-value" style="color: {color}">{score}%</div>
-                <div class="metric-label">Overall Score</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            ats_score = analysis.get('ats_compatibility', 0)
-            color = get_score_color(ats_score)
-            st.markdown(f"""
-            <div class="metric-container">
-                <div class="metric-value" style="color: {color}">{ats_score}%</div>
-                <div class="metric-label">ATS Compatibility</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col3:
-            format_score = analysis.get('formatting', {}).get('score', 0)
-            color = get_score_color(format_score)
-            st.markdown(f"""
-            <div class="metric-container">
-                <div class="metric-value" style="color: {color}">{format_score}%</div>
-                <div class="metric-label">Formatting Score</div>
-            </div>
-            """, unsafe_allow_html=True)
-    
-    # Enhanced Keywords Analysis for job-specific analysis
-    keywords = analysis.get('keywords', {})
-    if keywords:
-        st.markdown("""
-        <div style="background: linear-gradient(135deg, #e6fffa 0%, #b2f5ea 100%); 
-                    padding: 1.5rem; border-radius: 16px; color: #234e52; text-align: center; margin: 2rem 0 1rem 0;">
-            <h3 style="color: #234e52; margin: 0 0 0.5rem 0;">🏷️ Keywords Analysis Overview</h3>
-            <p style="opacity: 0.8; margin: 0;">Your resume's keyword performance</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Keywords Summary with visual indicators
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            found_keywords = keywords.get('found_keywords', [])
-            if found_keywords:
-                st.markdown("""
-                <div style="background: white; padding: 1.5rem; border-radius: 12px; 
-                            box-shadow: 0 4px 6px rgba(0,0,0,0.1); margin-bottom: 1rem;">
-                    <div style="text-align: center; margin-bottom: 1rem;">
-                        <div style="font-size: 2rem; color: #48bb78;">✅</div>
-                        <h4 style="color: #48bb78; margin: 0.5rem 0;">Found Keywords</h4>
-                        <div style="font-size: 1.5rem; font-weight: bold; color: #2d3748;">{}</div>
-                    </div>
-                </div>
-                """.format(len(found_keywords)), unsafe_allow_html=True)
-                
-                st.markdown("**Top keywords in your resume:**")
-                for keyword in found_keywords[:8]:
-                    st.markdown(f"""
-                    <div style="background: linear-gradient(135deg, #c6f6d5 0%, #9ae6b4 100%); 
-                                padding: 0.4rem 0.8rem; border-radius: 15px; margin: 0.2rem 0; 
-                                display: inline-block; margin-right: 0.5rem;">
-                        <span style="color: #22543d; font-weight: 500; font-size: 0.85rem;">✅ {keyword}</span>
-                    </div>
-                    """, unsafe_allow_html=True)
-        
-        with col2:
-            missing_keywords = keywords.get('missing_keywords', [])
-            if missing_keywords:
-                st.markdown("""
-                <div style="background: white; padding: 1.5rem; border-radius: 12px; 
-                            box-shadow: 0 4px 6px rgba(0,0,0,0.1); margin-bottom: 1rem;">
-                    <div style="text-align: center; margin-bottom: 1rem;">
-                        <div style="font-size: 2rem; color: #f56565;">❌</div>
-                        <h4 style="color: #f56565; margin: 0.5rem 0;">Missing Keywords</h4>
-                        <div style="font-size: 1.5rem; font-weight: bold; color: #2d3748;">{}</div>
-                    </div>
-                </div>
-                """.format(len(missing_keywords)), unsafe_allow_html=True)
-                
-                st.markdown("**Consider adding these keywords:**")
-                for keyword in missing_keywords[:8]:
-                    st.markdown(f"""
-                    <div style="background: linear-gradient(135deg, #fed7d7 0%, #feb2b2 100%); 
-                                padding: 0.4rem 0.8rem; border-radius: 15px; margin: 0.2rem 0; 
-                                display: inline-block; margin-right: 0.5rem;">
-                        <span style="color: #744210; font-weight: 500; font-size: 0.85rem;">❌ {keyword}</span>
-                    </div>
-                    """, unsafe_allow_html=True)
-        
-        # Job-specific keyword analysis with enhanced visuals
-        if is_job_specific:
-            st.markdown("""
-            <div style="background: linear-gradient(135deg, #ffd89b 0%, #19547b 100%); 
-                        padding: 1.5rem; border-radius: 16px; color: white; text-align: center; margin: 2rem 0 1rem 0;">
-                <h4 style="color: white; margin: 0 0 0.5rem 0;">🎯 Job-Specific Skills Analysis</h4>
-                <p style="opacity: 0.9; margin: 0;">Required skills evaluation for this position</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                required_found = keywords.get('required_skills_found', [])
-                if required_found:
-                    st.markdown("""
-                    <div style="background: linear-gradient(135deg, #c6f6d5 0%, #9ae6b4 100%); 
-                                padding: 1.5rem; border-radius: 12px; margin-bottom: 1rem;">
-                        <div style="text-align: center; margin-bottom: 1rem;">
-                            <div style="font-size: 2.5rem; color: #22543d;">🎉</div>
-                            <h4 style="color: #22543d; margin: 0;">Required Skills You Have</h4>
-                            <p style="color: #22543d; margin: 0.5rem 0 0 0; font-size: 0.9rem;">Great job matching the requirements!</p>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    for skill in required_found:
-                        st.markdown(f"""
-                        <div style="background: white; padding: 0.8rem; border-radius: 8px; 
-                                    margin-bottom: 0.3rem; border-left: 4px solid #48bb78; 
-                                    box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
-                            <div style="display: flex; align-items: center;">
-                                <span style="color: #48bb78; margin-right: 0.5rem;">🎯</span>
-                                <span style="color: #2d3748; font-weight: 500;">{skill}</span>
-                            </div>
-                        </div>
-                        """, unsafe_allow_html=True)
-            
-            with col2:
-                required_missing = keywords.get('required_skills_missing', [])
-                if required_missing:
-                    st.markdown("""
-                    <div style="background: linear-gradient(135deg, #fed7d7 0%, #feb2b2 100%); 
-                                padding: 1.5rem; border-radius: 12px; margin-bottom: 1rem;">
-                        <div style="text-align: center; margin-bottom: 1rem;">
-                            <div style="font-size: 2.5rem; color: #c53030;">⚠️</div>
-                            <h4 style="color: #c53030; margin: 0;">Missing Required Skills</h4>
-                            <p style="color: #744210; margin: 0.5rem 0 0 0; font-size: 0.9rem;">Priority areas for improvement</p>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    for skill in required_missing:
-                        st.markdown(f"""
-                        <div style="background: white; padding: 0.8rem; border-radius: 8px; 
-                                    margin-bottom: 0.3rem; border-left: 4px solid #f56565; 
-                                    box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
-                            <div style="display: flex; align-items: center;">
-                                <span style="color: #f56565; margin-right: 0.5rem;">🚨</span>
-                                <span style="color: #2d3748; font-weight: 500;">{skill}</span>
-                            </div>
-                        </div>
-                        """, unsafe_allow_html=True)
-    
-    # Enhanced Section-wise analysis with visual cards
-    st.markdown("""
-    <div style="background: linear-gradient(135deg, #a8edea 0%, #fed6e3 100%); 
-                padding: 1.5rem; border-radius: 16px; color: #2d3748; text-align: center; margin: 2rem 0 1rem 0;">
-        <h3 style="color: #2d3748; margin: 0 0 0.5rem 0;">📋 Section-wise Analysis</h3>
-        <p style="opacity: 0.8; margin: 0;">Detailed breakdown of each resume section</p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    sections = analysis.get('sections_analysis', {})
-    if sections:
-        # Create visual cards for each section
-        section_icons = {
-            'summary': '📝',
-            'experience': '💼', 
-            'skills': '🔧',
-            'education': '🎓',
-            'projects': '🚀',
-            'certifications': '📜',
-            'contact': '📞',
-            'formatting': '🎨'
-        }
-        
-        # Display sections in a grid
-        cols = st.columns(2)
-        section_items = list(sections.items())
-        
-        for i, (section_name, section_data) in enumerate(section_items):
-            if section_data:
-                with cols[i % 2]:
-                    icon = section_icons.get(section_name.lower(), '📄')
-                    section_title = section_name.replace('_', ' ').title()
-                    
-                    # Get section score if available
-                    section_score = None
-                    if isinstance(section_data, dict):
-                        section_score = section_data.get('score', None)
-                    
-                    # Create expandable section card
-                    if section_score is not None:
-                        color = get_score_color(section_score)
-                        # Create a clean card header
-                        st.markdown(f"""
-                        <div style="background: white; padding: 1.5rem; border-radius: 12px; 
-                                    margin-bottom: 1rem; box-shadow: 0 4px 6px rgba(0,0,0,0.1); 
-                                    border-left: 4px solid #667eea;">
-                            <div style="text-align: right; margin-bottom: 0.5rem;">
-                                <span style="background: {color}; color: white; padding: 0.3rem 0.8rem; 
-                                           border-radius: 20px; font-weight: bold; font-size: 0.9rem;">{section_score}%</span>
-                            </div>
-                            <div style="display: flex; align-items: center; justify-content: space-between;">
-                                <div style="display: flex; align-items: center;">
-                                    <span style="font-size: 1.5rem; margin-right: 0.5rem;">{icon}</span>
-                                    <h4 style="color: #2d3748; margin: 0;">{section_title}</h4>
-                                </div>
-                                <span style="color: #cbd5e0; font-size: 0.9rem;">Click to expand ▼</span>
-                            </div>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    else:
-                        st.markdown(f"""
-                        <div style="background: white; padding: 1.5rem; border-radius: 12px; 
-                                    margin-bottom: 1rem; box-shadow: 0 4px 6px rgba(0,0,0,0.1); 
-                                    border-left: 4px solid #667eea;">
-                            <div style="display: flex; align-items: center; justify-content: space-between;">
-                                <div style="display: flex; align-items: center;">
-                                    <span style="font-size: 1.5rem; margin-right: 0.5rem;">{icon}</span>
-                                    <h4 style="color: #2d3748; margin: 0;">{section_title}</h4>
-                                </div>
-                                <span style="color: #cbd5e0; font-size: 0.9rem;">Click to expand ▼</span>
-                            </div>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    # Create expandable content area
-                    with st.expander("📋 View Detailed Analysis", expanded=False):
-                        show_section_analysis_enhanced(section_name, section_data)
-    else:
-        st.markdown("""
-        <div style="background: #f7fafc; padding: 2rem; border-radius: 12px; text-align: center; 
-                    border: 2px dashed #cbd5e0; margin: 1rem 0;">
-            <div style="font-size: 2rem; margin-bottom: 1rem; opacity: 0.6;">📋</div>
-            <p style="color: #718096; margin: 0;">No detailed section analysis available</p>
-        </div>
-        """, unsafe_allow_html=True)
-
-def show_section_analysis_enhanced(section_name, section_data):
-    """Display section analysis content with enhanced styling using proper Streamlit components"""
-    if not section_data:
-        st.markdown("*No analysis available*")
-        return
-    
-    if isinstance(section_data, str):
-        st.markdown(f"""
-        <div style="background: #f8fafc; padding: 1rem; border-radius: 8px; border-left: 4px solid #667eea; margin-bottom: 0.5rem;">
-            <strong style="color: #667eea;">📋 Analysis:</strong><br>
-            <span style="color: #4a5568;">{section_data}</span>
-        </div>
-        """, unsafe_allow_html=True)
-        return
-    
-    if isinstance(section_data, dict):
-        # Handle content/feedback first
-        if 'content' in section_data and section_data['content']:
-            st.markdown(f"""
-            <div style="background: #f8fafc; padding: 1rem; border-radius: 8px; border-left: 4px solid #667eea; margin-bottom: 0.8rem;">
-                <strong style="color: #667eea;">📋 Content:</strong><br>
-                <span style="color: #4a5568; font-size: 0.9rem;">{section_data['content']}</span>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        if 'feedback' in section_data and section_data['feedback']:
-            st.markdown(f"""
-            <div style="background: #f0fff4; padding: 1rem; border-radius: 8px; border-left: 4px solid #48bb78; margin-bottom: 0.8rem;">
-                <strong style="color: #48bb78;">💬 Feedback:</strong><br>
-                <span style="color: #4a5568; font-size: 0.9rem;">{section_data['feedback']}</span>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        # Handle suggestions
-        if 'suggestions' in section_data:
-            suggestions = section_data['suggestions']
-            if isinstance(suggestions, list) and suggestions:
-                suggestions_text = "<br>".join([f"• {suggestion}" for suggestion in suggestions[:3]])
-                st.markdown(f"""
-                <div style="background: #fffaf0; padding: 1rem; border-radius: 8px; border-left: 4px solid #ed8936; margin-bottom: 0.8rem;">
-                    <strong style="color: #ed8936;">💡 Suggestions:</strong><br>
-                    <span style="color: #4a5568; font-size: 0.9rem;">{suggestions_text}</span>
-                </div>
-                """, unsafe_allow_html=True)
-            elif isinstance(suggestions, str):
-                st.markdown(f"""
-                <div style="background: #fffaf0; padding: 1rem; border-radius: 8px; border-left: 4px solid #ed8936; margin-bottom: 0.8rem;">
-                    <strong style="color: #ed8936;">💡 Suggestions:</strong><br>
-                    <span style="color: #4a5568; font-size: 0.9rem;">{suggestions}</span>
-                </div>
-                """, unsafe_allow_html=True)
-        
-        # Handle issues
-        if 'issues' in section_data:
-            issues = section_data['issues']
-            if isinstance(issues, list) and issues:
-                issues_text = "<br>".join([f"• {issue}" for issue in issues[:3]])
-                st.markdown(f"""
-                <div style="background: #fef2f2; padding: 1rem; border-radius: 8px; border-left: 4px solid #f56565; margin-bottom: 0.8rem;">
-                    <strong style="color: #f56565;">⚠️ Issues:</strong><br>
-                    <span style="color: #4a5568; font-size: 0.9rem;">{issues_text}</span>
-                </div>
-                """, unsafe_allow_html=True)
-            elif isinstance(issues, str):
-                st.markdown(f"""
-                <div style="background: #fef2f2; padding: 1rem; border-radius: 8px; border-left: 4px solid #f56565; margin-bottom: 0.8rem;">
-                    <strong style="color: #f56565;">⚠️ Issues:</strong><br>
-                    <span style="color: #4a5568; font-size: 0.9rem;">{issues}</span>
-                </div>
-                """, unsafe_allow_html=True)
-        
-        # Handle strengths
-        if 'strengths' in section_data:
-            strengths = section_data['strengths']
-            if isinstance(strengths, list) and strengths:
-                strengths_text = "<br>".join([f"• {strength}" for strength in strengths[:3]])
-                st.markdown(f"""
-                <div style="background: #f0fff4; padding: 1rem; border-radius: 8px; border-left: 4px solid #48bb78; margin-bottom: 0.8rem;">
-                    <strong style="color: #48bb78;">✅ Strengths:</strong><br>
-                    <span style="color: #4a5568; font-size: 0.9rem;">{strengths_text}</span>
-                </div>
-                """, unsafe_allow_html=True)
-            elif isinstance(strengths, str):
-                st.markdown(f"""
-                <div style="background: #f0fff4; padding: 1rem; border-radius: 8px; border-left: 4px solid #48bb78; margin-bottom: 0.8rem;">
-                    <strong style="color: #48bb78;">✅ Strengths:</strong><br>
-                    <span style="color: #4a5568; font-size: 0.9rem;">{strengths}</span>
-                </div>
-                """, unsafe_allow_html=True)
-        
-        # Handle any other fields
-        handled_keys = {'score', 'feedback', 'suggestions', 'issues', 'strengths', 'content'}
-        for key, value in section_data.items():
-            if key not in handled_keys and value:
-                if isinstance(value, list):
-                    items_text = "<br>".join([f"• {str(item)}" for item in value[:3]])
-                    st.markdown(f"""
-                    <div style="background: #f7fafc; padding: 1rem; border-radius: 8px; border-left: 4px solid #9f7aea; margin-bottom: 0.8rem;">
-                        <strong style="color: #9f7aea;">📄 {key.title()}:</strong><br>
-                        <span style="color: #4a5568; font-size: 0.9rem;">{items_text}</span>
-                    </div>
-                    """, unsafe_allow_html=True)
-                else:
-                    st.markdown(f"""
-                    <div style="background: #f7fafc; padding: 1rem; border-radius: 8px; border-left: 4px solid #9f7aea; margin-bottom: 0.8rem;">
-                        <strong style="color: #9f7aea;">📄 {key.title()}:</strong><br>
-                        <span style="color: #4a5568; font-size: 0.9rem;">{value}</span>
-                    </div>
-                    """, unsafe_allow_html=True)
-        
-        # If no specific content was found, show a generic message
-        if not any(key in section_data for key in ['feedback', 'suggestions', 'issues', 'strengths', 'content']) and len([k for k in section_data.keys() if k != 'score']) == 0:
-            st.markdown("""
-            <div style="text-align: center; padding: 1rem; color: #48bb78;">
-                <span style="font-size: 1.2rem;">✅</span><br>
-                <em>Analysis completed successfully</em>
-            </div>
-            """, unsafe_allow_html=True)
-    else:
-        st.markdown(f"""
-        <div style="background: #f8fafc; padding: 1rem; border-radius: 8px; border-left: 4px solid #667eea; margin-bottom: 0.5rem;">
-            <strong style="color: #667eea;">📋 Analysis:</strong><br>
-            <span style="color: #4a5568;">{str(section_data)}</span>
-        </div>
-        """, unsafe_allow_html=True)
-
-def get_section_content_for_card(section_data):
-    """Format section analysis content for display inside cards with proper HTML styling"""
-    if not section_data:
-        return "<em>No analysis available</em>"
-    
-    if isinstance(section_data, str):
-        return f"<div style='margin-bottom: 0.5rem;'><strong>📋 Analysis:</strong> {section_data}</div>"
-    
-    if isinstance(section_data, dict):
-        content_parts = []
-        
-        # Handle content/feedback first
-        if 'content' in section_data and section_data['content']:
-            content_parts.append(f"""
-            <div style='margin-bottom: 1rem; padding: 0.8rem; background: #f8fafc; border-radius: 6px; border-left: 3px solid #667eea;'>
-                <strong style='color: #667eea;'>📋 Content:</strong><br>
-                <span style='color: #4a5568; font-size: 0.9rem;'>{section_data['content']}</span>
-            </div>
-            """)
-        
-        if 'feedback' in section_data and section_data['feedback']:
-            content_parts.append(f"""
-            <div style='margin-bottom: 1rem; padding: 0.8rem; background: #f0fff4; border-radius: 6px; border-left: 3px solid #48bb78;'>
-                <strong style='color: #48bb78;'>💬 Feedback:</strong><br>
-                <span style='color: #4a5568; font-size: 0.9rem;'>{section_data['feedback']}</span>
-            </div>
-            """)
-        
-        # Handle suggestions
-        if 'suggestions' in section_data:
-            suggestions = section_data['suggestions']
-            if isinstance(suggestions, list) and suggestions:
-                suggestions_html = "<br>".join([f"• {suggestion}" for suggestion in suggestions[:3]])
-                content_parts.append(f"""
-                <div style='margin-bottom: 1rem; padding: 0.8rem; background: #fffaf0; border-radius: 6px; border-left: 3px solid #ed8936;'>
-                    <strong style='color: #ed8936;'>💡 Suggestions:</strong><br>
-                    <span style='color: #4a5568; font-size: 0.9rem;'>{suggestions_html}</span>
-                </div>
-                """)
-            elif isinstance(suggestions, str):
-                content_parts.append(f"""
-                <div style='margin-bottom: 1rem; padding: 0.8rem; background: #fffaf0; border-radius: 6px; border-left: 3px solid #ed8936;'>
-                    <strong style='color: #ed8936;'>💡 Suggestions:</strong><br>
-                    <span style='color: #4a5568; font-size: 0.9rem;'>{suggestions}</span>
-                </div>
-                """)
-        
-        # Handle issues
-        if 'issues' in section_data:
-            issues = section_data['issues']
-            if isinstance(issues, list) and issues:
-                issues_html = "<br>".join([f"• {issue}" for issue in issues[:3]])
-                content_parts.append(f"""
-                <div style='margin-bottom: 1rem; padding: 0.8rem; background: #fef2f2; border-radius: 6px; border-left: 3px solid #f56565;'>
-                    <strong style='color: #f56565;'>⚠️ Issues:</strong><br>
-                    <span style='color: #4a5568; font-size: 0.9rem;'>{issues_html}</span>
-                </div>
-                """)
-            elif isinstance(issues, str):
-                content_parts.append(f"""
-                <div style='margin-bottom: 1rem; padding: 0.8rem; background: #fef2f2; border-radius: 6px; border-left: 3px solid #f56565;'>
-                    <strong style='color: #f56565;'>⚠️ Issues:</strong><br>
-                    <span style='color: #4a5568; font-size: 0.9rem;'>{issues}</span>
-                </div>
-                """)
-        
-        # Handle strengths
-        if 'strengths' in section_data:
-            strengths = section_data['strengths']
-            if isinstance(strengths, list) and strengths:
-                strengths_html = "<br>".join([f"• {strength}" for strength in strengths[:3]])
-                content_parts.append(f"""
-                <div style='margin-bottom: 1rem; padding: 0.8rem; background: #f0fff4; border-radius: 6px; border-left: 3px solid #48bb78;'>
-                    <strong style='color: #48bb78;'>✅ Strengths:</strong><br>
-                    <span style='color: #4a5568; font-size: 0.9rem;'>{strengths_html}</span>
-                </div>
-                """)
-            elif isinstance(strengths, str):
-                content_parts.append(f"""
-                <div style='margin-bottom: 1rem; padding: 0.8rem; background: #f0fff4; border-radius: 6px; border-left: 3px solid #48bb78;'>
-                    <strong style='color: #48bb78;'>✅ Strengths:</strong><br>
-                    <span style='color: #4a5568; font-size: 0.9rem;'>{strengths}</span>
-                </div>
-                """)
+            else:
+                button_text = "📝 Auto-Improve"
+                title_text = "📝 Auto-Improvement Options"
+            
+            if st.button(button_text, use_container_width=True):
+                st.session_state.update(response_content="auto_improve", response_type="improve", response_title=title_text)
+                st.rerun(scope="fragment")
+    
+        # st.markdown("---")
+    
+    if st.session_state.response_content:
+        display_response_content()
+    else:
+        # Enhanced feature highlights - only on the landing view, not while a result is open
+        st.markdown(FEATURE_GRID_HTML, unsafe_allow_html=True)
         
-        # Handle any other fields
-        handled_keys = {'score', 'feedback', 'suggestions', 'issues', 'strengths', 'content'}
-        for key, value in section_data.items():
-            if key not in handled_keys and value:
-                if isinstance(value, list):
-                    items_html = "<br>".join([f"• {str(item)}" for item in value[:3]])
-                    content_parts.append(f"""
-                    <div style='margin-bottom: 1rem; padding: 0.8rem; background: #f7fafc; border-radius: 6px; border-left: 3px solid #9f7aea;'>
-                        <strong style='color: #9f7aea;'>📄 {key.title()}:</strong><br>
-                        <span style='color: #4a5568; font-size: 0.9rem;'>{items_html}</span>
-                    </div>
-                    """)
-                else:
-                    content_parts.append(f"""
-                    <div style='margin-bottom: 1rem; padding: 0.8rem; background: #f7fafc; border-radius: 6px; border-left: 3px solid #9f7aea;'>
-                        <strong style='color: #9f7aea;'>📄 {key.title()}:</strong><br>
-                        <span style='color: #4a5568; font-size: 0.9rem;'>{value}</span>
-                    </div>
-                    """)
+        # Call-to-action section moved to top for better user flow
+        st.markdown(CTA_HTML, unsafe_allow_html=True)
         
-        # If no specific content was found, show a generic message
-        if not content_parts:
-            return """
-            <div style='text-align: center; padding: 1rem; color: #48bb78;'>
-                <span style='font-size: 1.2rem;'>✅</span><br>
-                <em>Analysis completed successfully</em>
-            </div>
-            """
+        # Enhanced visual showcase of features - moved below call-to-action
+        st.markdown(SHOWCASE_TITLE_HTML, unsafe_allow_html=True)
         
-        return "".join(content_parts)
+        # Create visually appealing feature cards in a grid with consistent sizing
+        st.markdown(SHOWCASE_GRID_HTML, unsafe_allow_html=True)
+
+def display_response_content():
+    """Display response content based on type - Same pattern as DOC-GPT"""
+    renderer = RESPONSE_RENDERERS.get(st.session_state.response_type)
+    if renderer:
+        renderer()
     
-    return f"<div style='margin-bottom: 0.5rem;'><strong>📋 Analysis:</strong> {str(section_data)}</div>"
+    # Clear response button
+    if st.button("✖️ Clear Results", key="clear_response"):
+        st.session_state.update(response_content=None, response_type=None, response_title=None)
+        st.rerun(scope="fragment")
 
-def show_section_analysis_content(section_name, section_data):
-    """Display section analysis content using proper markdown rendering"""
-    if not section_data:
-        st.markdown("*No analysis available*")
+def render_metric_row(metrics):
+    """Render (score, label) pairs as a row of native st.metric widgets"""
+    with st.container():
+        for col, (score, label) in zip(st.columns(len(metrics), gap="small"), metrics):
+            col.metric(label=label, value=f"{score}%")
+
+@lru_cache(maxsize=32)
+def section_layout(section_names):
+    """(name, icon, title, escaped title) per section, cached per ordered tuple of section names"""
+    layout = []
+    for section_name in section_names:
+        title = section_name.replace('_', ' ').title()
+        layout.append((section_name, SECTION_ICONS.get(section_name.lower(), '📄'), title, escape_html(title)))
+    return tuple(layout)
+
+def display_analysis_results():
+    """Display analysis results"""
+    if not st.session_state.analysis_results:
         return
     
-    if isinstance(section_data, str):
-        st.markdown(f"📋 {section_data}")
-        return
+    analysis = st.session_state.analysis_results
+    
+    st.markdown(RESPONSE_TITLE_TMPL.format(title=st.session_state.response_title), unsafe_allow_html=True)
     
-    if isinstance(section_data, dict):
-        # Handle different types of section data
-        if 'feedback' in section_data:
-            st.markdown(f"**💬 Feedback:** {section_data['feedback']}")
+    # Check if this is a job-specific analysis
+    is_job_specific = st.session_state.is_job_specific
+    
+    if is_job_specific:
+        # Job-specific analysis - show 4 metrics
+        render_metric_row([
+            (analysis.get('overall_score', 0), "Overall Score"),
+            (analysis.get('job_match_score', 0), "Job Match"),
+            (analysis.get('ats_compatibility', 0), "ATS Compatibility"),
+            (analysis.get('formatting', {}).get('score', 0), "Formatting"),
+        ])
         
-        if 'suggestions' in section_data:
-            suggestions = section_data['suggestions']
-            if isinstance(suggestions, list) and suggestions:
-                st.markdown("**💡 Suggestions:**")
-                for suggestion in suggestions[:3]:
-                    st.markdown(f"• {suggestion}")
-            elif isinstance(suggestions, str):
-                st.markdown(f"**💡 Suggestions:** {suggestions}")
+        # Job-specific analysis section
+        if 'job_specific_analysis' in analysis:
+            st.markdown("### 🎯 Job-Specific Analysis")
+            job_analysis = analysis['job_specific_analysis']
+            
+            render_metric_row([
+                (job_analysis.get('requirements_match', 0), "Requirements Met"),
+                (job_analysis.get('experience_relevance', 0), "Experience Relevance"),
+            ])
+            
+            # Enhanced visualization for qualification gaps and strengths
+            qualification_gaps = job_analysis.get('qualification_gaps', [])
+            strength_alignment = job_analysis.get('strength_alignment', [])
+            
+            if qualification_gaps or strength_alignment:
+                st.markdown(JOB_COMPATIBILITY_BANNER_HTML, unsafe_allow_html=True)
+                
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    if qualification_gaps:
+                        st.markdown(AREAS_TO_DEVELOP_HTML, unsafe_allow_html=True)
+                        
+                        # Collapsed by default so the gap cards are only laid out on demand
+                        with st.expander(f"📍 View {len(qualification_gaps)} areas to develop", expanded=False):
+                            gaps_html = "".join(GAP_ITEM_TMPL % escape_html(gap) for gap in qualification_gaps)
+                            st.markdown(gaps_html, unsafe_allow_html=True)
+                
+                with col2:
+                    if strength_alignment:
+                        st.markdown(COMPETITIVE_EDGE_HTML, unsafe_allow_html=True)
+                        
+                        with st.expander(f"⭐ View {len(strength_alignment)} matching strengths", expanded=True):
+                            strengths_html = "".join(STRENGTH_ITEM_TMPL % escape_html(strength) for strength in strength_alignment)
+                            st.markdown(strengths_html, unsafe_allow_html=True)
         
-        if 'issues' in section_data:
-            issues = section_data['issues']
-            if isinstance(issues, list) and issues:
-                st.markdown("**⚠️ Issues:**")
-                for issue in issues[:3]:
-                    st.markdown(f"• {issue}")
-            elif isinstance(issues, str):
-                st.markdown(f"**⚠️ Issues:** {issues}")
+    else:
+        # General analysis - show 3 metrics
+        render_metric_row([
+            (analysis.get('overall_score', 0), "Overall Score"),
+            (analysis.get('ats_compatibility', 0), "ATS Compatibility"),
+            (analysis.get('formatting', {}).get('score', 0), "Formatting Score"),
+        ])
+    
+    # Enhanced Keywords Analysis for job-specific analysis
+    keywords = analysis.get('keywords', {})
+    if keywords:
+        st.markdown(KEYWORDS_OVERVIEW_BANNER_HTML, unsafe_allow_html=True)
         
-        if 'strengths' in section_data:
-            strengths = section_data['strengths']
-            if isinstance(strengths, list) and strengths:
-                st.markdown("**✅ Strengths:**")
-                for strength in strengths[:3]:
-                    st.markdown(f"• {strength}")
-            elif isinstance(strengths, str):
-                st.markdown(f"**✅ Strengths:** {strengths}")
+        # Keywords Summary with visual indicators
+        col1, col2 = st.columns(2)
         
-        # Handle any other fields
-        handled_keys = {'score', 'feedback', 'suggestions', 'issues', 'strengths'}
-        other_content = []
-        for key, value in section_data.items():
-            if key not in handled_keys and value:
-                if isinstance(value, list):
-                    other_content.append(f"**{key.title()}:**")
-                    for item in value[:3]:
-                        other_content.append(f"• {str(item)}")
-                else:
-                    other_content.append(f"**{key.title()}:** {value}")
+        with col1:
+            found_keywords = keywords.get('found_keywords', [])
+            if found_keywords:
+                st.markdown(FOUND_KEYWORDS_CARD_TMPL.format(count=len(found_keywords)), unsafe_allow_html=True)
+                
+                with st.expander("Top keywords in your resume", expanded=False):
+                    chips_html = "".join(FOUND_KEYWORD_CHIP_TMPL % escape_html(keyword) for keyword in found_keywords[:8])
+                    st.markdown(chips_html, unsafe_allow_html=True)
         
-        if other_content:
-            for content in other_content:
-                st.markdown(content)
+        with col2:
+            missing_keywords = keywords.get('missing_keywords', [])
+            if missing_keywords:
+                st.markdown(MISSING_KEYWORDS_CARD_TMPL.format(count=len(missing_keywords)), unsafe_allow_html=True)
+                
+                with st.expander("Consider adding these keywords", expanded=False):
+                    chips_html = "".join(MISSING_KEYWORD_CHIP_TMPL % escape_html(keyword) for keyword in missing_keywords[:8])
+                    st.markdown(chips_html, unsafe_allow_html=True)
         
-        # If no specific content was found, show a generic message
-        if not any(key in section_data for key in ['feedback', 'suggestions', 'issues', 'strengths']) and not other_content:
-            st.markdown("✅ *Analysis completed*")
-    else:
-        st.markdown(f"📋 {str(section_data)}")
-
-def show_section_analysis_inline(section_name, section_data):
-    """Helper function to format section analysis for inline display"""
-    if not section_data:
-        return "No analysis available"
+        # Job-specific keyword analysis with enhanced visuals
+        if is_job_specific:
+            st.markdown(JOB_SKILLS_BANNER_HTML, unsafe_allow_html=True)
+            
+            required_found = keywords.get('required_skills_found', [])
+            required_missing = keywords.get('required_skills_missing', [])
+            
+            # Only allocate a column for each skills panel that has content
+            skill_panels = []
+            if required_found:
+                skills_html = "".join(REQUIRED_SKILL_FOUND_TMPL % escape_html(skill) for skill in required_found)
+                skill_panels.append(REQUIRED_SKILLS_FOUND_HTML + skills_html)
+            if required_missing:
+                skills_html = "".join(REQUIRED_SKILL_MISSING_TMPL % escape_html(skill) for skill in required_missing)
+                skill_panels.append(REQUIRED_SKILLS_MISSING_HTML + skills_html)
+            
+            if skill_panels:
+                for col, panel_html in zip(st.columns(len(skill_panels)), skill_panels):
+                    with col:
+                        st.markdown(panel_html, unsafe_allow_html=True)
     
-    if isinstance(section_data, str):
-        return section_data
+    # Enhanced Section-wise analysis with visual cards
+    st.markdown(SECTION_ANALYSIS_BANNER_HTML, unsafe_allow_html=True)
     
-    if isinstance(section_data, dict):
-        results = []
-        
-        # Handle different types of section data
-        if 'feedback' in section_data:
-            results.append(f"<strong>Feedback:</strong> {section_data['feedback']}")
-        
-        if 'suggestions' in section_data:
-            suggestions = section_data['suggestions']
-            if isinstance(suggestions, list) and suggestions:
-                results.append(f"<strong>Suggestions:</strong><br>• " + "<br>• ".join(suggestions[:3]))
-            elif isinstance(suggestions, str):
-                results.append(f"<strong>Suggestions:</strong> {suggestions}")
-        
-        if 'issues' in section_data:
-            issues = section_data['issues']
-            if isinstance(issues, list) and issues:
-                results.append(f"<strong>Issues:</strong><br>• " + "<br>• ".join(issues[:3]))
-            elif isinstance(issues, str):
-                results.append(f"<strong>Issues:</strong> {issues}")
+    sections = analysis.get('sections_analysis', {})
+    if sections:
+        section_items = [
+            (section_name, icon, title, title_html, sections[section_name])
+            for section_name, icon, title, title_html in section_layout(tuple(sections))
+            if sections[section_name]
+        ]
         
-        if 'strengths' in section_data:
-            strengths = section_data['strengths']
-            if isinstance(strengths, list) and strengths:
-                results.append(f"<strong>Strengths:</strong><br>• " + "<br>• ".join(strengths[:3]))
-            elif isinstance(strengths, str):
-                results.append(f"<strong>Strengths:</strong> {strengths}")
+        # All section cards go out as one grid block instead of a markdown call per card
+        card_htmls = []
+        for section_name, icon, title, section_title, section_data in section_items:
+            # Score badge only when the section has a score
+            section_score = section_data.get('score') if isinstance(section_data, dict) else None
+            badge = SECTION_SCORE_BADGE_TMPL % (get_score_color(section_score), section_score) if section_score is not None else ""
+            card_htmls.append(SECTION_CARD_TMPL.format(badge=badge, icon=icon, section_title=section_title))
         
-        # If no specific fields, try to format general content
-        if not results:
-            for key, value in section_data.items():
-                if key not in ['score'] and value:
-                    if isinstance(value, list):
-                        results.append(f"<strong>{key.title()}:</strong><br>• " + "<br>• ".join(str(v) for v in value[:3]))
-                    else:
-                        results.append(f"<strong>{key.title()}:</strong> {value}")
+        st.markdown(SECTION_GRID_TMPL % "".join(card_htmls), unsafe_allow_html=True)
         
-        return "<br><br>".join(results) if results else "Analysis completed"
+        # Expanders need their own widgets, so they follow the grid in a second pass
+        for section_name, icon, title, section_title, section_data in section_items:
+            with st.expander(f"{icon} {title} - Detailed Analysis", expanded=False):
+                show_section_analysis_enhanced(section_name, section_data)
+    else:
+        st.markdown(NO_SECTION_ANALYSIS_HTML, unsafe_allow_html=True)
+
+# Known section analysis fields, in display order: (key, label, accent color, background)
+SECTION_FIELD_SPEC = (
+    ('content', '📋 Content', '#667eea', '#f8fafc'),
+    ('feedback', '💬 Feedback', '#48bb78', '#f0fff4'),
+    ('suggestions', '💡 Suggestions', '#ed8936', '#fffaf0'),
+    ('issues', '⚠️ Issues', '#f56565', '#fef2f2'),
+    ('strengths', '✅ Strengths', '#48bb78', '#f0fff4'),
+)
+SECTION_FIELD_KEYS = frozenset(['score'] + [spec[0] for spec in SECTION_FIELD_SPEC])
+
+def section_field_entries(section_data):
+    """(label, accent, background, value) for each populated field of a section analysis"""
+    if not isinstance(section_data, dict):
+        return [('📋 Analysis', '#667eea', '#f8fafc', str(section_data))]
+    
+    entries = []
+    for key, label, accent, bg in SECTION_FIELD_SPEC:
+        value = section_data.get(key)
+        if value:
+            entries.append((label, accent, bg, value))
+    
+    # Any other fields the model returned
+    for key, value in section_data.items():
+        if value and key not in SECTION_FIELD_KEYS:
+            entries.append((f"📄 {key.title()}", '#9f7aea', '#f7fafc', value))
+    return entries
+
+def format_section_analysis(section_data):
+    """Format a section analysis as styled HTML cards"""
+    if not section_data:
+        return "<em>No analysis available</em>"
+    
+    parts = []
+    for label, accent, bg, value in section_field_entries(section_data):
+        # List and tuple values both render as up to three bullets
+        if isinstance(value, (list, tuple)):
+            text = "<br>".join(islice((f"• {escape_html(item)}" for item in value), 3))
+        else:
+            text = escape_html(value)
+        parts.append(SECTION_FIELD_TMPL.format(bg=bg, accent=accent, label=escape_html(label), text=text))
     
-    return str(section_data)
+    return "".join(parts) if parts else ANALYSIS_COMPLETE_HTML
+
+@st.cache_data(show_spinner=False, max_entries=256, ttl=3600)
+def _section_html_cached(section_hash, _section_data):
+    """Styled HTML for one section analysis, keyed on a hash of its JSON payload"""
+    return format_section_analysis(_section_data)
+
+def section_analysis_html(section_data):
+    """Styled HTML for a section analysis, reused across reruns while the analysis is unchanged"""
+    # Keys stay in the model's order - it is the order extra fields are rendered in
+    return _section_html_cached(get_content_hash(json.dumps(section_data)), section_data)
+
+def show_section_analysis_enhanced(section_name, section_data):
+    """Display section analysis content as styled cards"""
+    st.markdown(section_analysis_html(section_data), unsafe_allow_html=True)
+
+def analysis_view(name, build):
+    """Markup for one results view, rebuilt only when a new analysis replaces the current one"""
+    current_hash = st.session_state.last_analyzed_hash
+    cached = st.session_state.analysis_views.get(name)
+    if cached is None or cached[0] != current_hash:
+        cached = (current_hash, build())
+        st.session_state.analysis_views[name] = cached
+    return cached[1]
+
+def build_score_cards_html(analysis, colors, is_job_specific):
+    """Score card markup: a 2x2 grid of the headline scores for job-specific results, else the ATS hero"""
+    if not is_job_specific:
+        return ATS_SCORE_HERO_TMPL.format(color=colors["ats"], score=analysis.get('ats_compatibility', 0))
+    
+    # Row by row: Overall | Job Match, then ATS | Formatting
+    scores = (
+        ("Overall Score", "overall", analysis.get('overall_score', 0)),
+        ("Job Match Score", "job", analysis.get('job_match_score', 0)),
+        ("ATS Compatibility", "ats", analysis.get('ats_compatibility', 0)),
+        ("Formatting Score", "format", analysis.get('formatting', {}).get('score', 0)),
+    )
+    cards_html = "".join(SCORE_CARD_TMPL.format(color=colors[key], score=score, label=label) for label, key, score in scores)
+    return SCORE_GRID_TMPL % cards_html
 
 def display_ats_score():
     """Display ATS compatibility and job match scores"""
-    if not st.session_state.analysis_results:
+    analysis = st.session_state.analysis_results
+    if not analysis:
         return
     
-    analysis = st.session_state.analysis_results
-    is_job_specific = 'job_match_score' in analysis
+    is_job_specific = st.session_state.is_job_specific
     
-    st.markdown(f"""
-    <div style="color: #667eea; font-size: 1.8rem; font-weight: bold; margin-bottom: 1rem; text-align: center; border-bottom: 2px solid #667eea; padding-bottom: 0.5rem;">
-        {st.session_state.response_title}
-    </div>
-    """, unsafe_allow_html=True)
+    score_cards_html = analysis_view("score_cards", lambda: build_score_cards_html(analysis, st.session_state.analysis_colors, is_job_specific))
+    
+    st.markdown(RESPONSE_TITLE_TMPL.format(title=st.session_state.response_title), unsafe_allow_html=True)
     
     if is_job_specific:
         # Job-specific score display - show all 4 key scores
         st.markdown("### 📊 Complete Score Breakdown")
         
         # Main scores in a 2x2 grid
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Overall Score
-            overall_score = analysis.get('overall_score', 0)
-            color = get_score_color(overall_score)
-            st.markdown(f"""
-            <div style="text-align: center; margin: 1rem 0; padding: 1rem; border: 2px solid {color}; border-radius: 10px;">
-                <div style="font-size: 3rem; font-weight: bold; color: {color};">{overall_score}%</div>
-                <div style="font-size: 1.1rem; color: #666;">Overall Score</div>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # ATS Compatibility
-            ats_score = analysis.get('ats_compatibility', 0)
-            color = get_score_color(ats_score)
-            st.markdown(f"""
-            <div style="text-align: center; margin: 1rem 0; padding: 1rem; border: 2px solid {color}; border-radius: 10px;">
-                <div style="font-size: 3rem; font-weight: bold; color: {color};">{ats_score}%</div>
-                <div style="font-size: 1.1rem; color: #666;">ATS Compatibility</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            # Job Match Score
-            job_score = analysis.get('job_match_score', 0)
-            color = get_score_color(job_score)
-            st.markdown(f"""
-            <div style="text-align: center; margin: 1rem 0; padding: 1rem; border: 2px solid {color}; border-radius: 10px;">
-                <div style="font-size: 3rem; font-weight: bold; color: {color};">{job_score}%</div>
-                <div style="font-size: 1.1rem; color: #666;">Job Match Score</div>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Formatting Score
-            format_score = analysis.get('formatting', {}).get('score', 0)
-            color = get_score_color(format_score)
-            st.markdown(f"""
-            <div style="text-align: center; margin: 1rem 0; padding: 1rem; border: 2px solid {color}; border-radius: 10px;">
-                <div style="font-size: 3rem; font-weight: bold; color: {color};">{format_score}%</div>
-                <div style="font-size: 1.1rem; color: #666;">Formatting Score</div>
-            </div>
-            """, unsafe_allow_html=True)
+        st.markdown(score_cards_html, unsafe_allow_html=True)
         
         # Job-specific detailed metrics
         job_analysis = analysis.get('job_specific_analysis', {})
         if job_analysis:
             st.markdown("### 🎯 Job-Specific Metrics")
             
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                req_match = job_analysis.get('requirements_match', 0)
-                color = get_score_color(req_match)
-                st.markdown(f"""
-                <div class="metric-container">
-                    <div class="metric-value" style="color: {color}">{req_match}%</div>
-                    <div class="metric-label">Requirements Met</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col2:
-                exp_rel = job_analysis.get('experience_relevance', 0)
-                color = get_score_color(exp_rel)
-                st.markdown(f"""
-                <div class="metric-container">
-                    <div class="metric-value" style="color: {color}">{exp_rel}%</div>
-                    <div class="metric-label">Experience Relevance</div>
-                </div>
-                """, unsafe_allow_html=True)
+            render_metric_row([
+                (job_analysis.get('requirements_match', 0), "Requirements Met"),
+                (job_analysis.get('experience_relevance', 0), "Experience Relevance"),
+            ])
     else:
         # General ATS Score display (fallback)
-        ats_score = analysis.get('ats_compatibility', 0)
-        color = get_score_color(ats_score)
-        st.markdown(f"""
-        <div style="text-align: center; margin: 2rem 0;">
-            <div style="font-size: 4rem; font-weight: bold; color: {color};">{ats_score}%</div>
-            <div style="font-size: 1.2rem; color: #666;">ATS Compatibility Score</div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(score_cards_html, unsafe_allow_html=True)
     
     # ATS Issues (common to both types)
     ats_issues = analysis.get('ats_issues', [])
@@ -1992,24 +1833,135 @@ def display_ats_score():
         for suggestion in formatting['suggestions']:
             st.markdown(f"• {suggestion}")
 
+# Suggestion category keywords, checked in priority order; anything unmatched is 'General'.
+# Plain substring matches, so "skills" still matches "skill".
+SUGGESTION_CATEGORY_WORDS = (
+    ('Skills', ('keyword', 'skill', 'technology', 'programming', 'technical')),
+    ('Formatting', ('format', 'layout', 'structure', 'organize', 'section')),
+    ('Experience', ('experience', 'work', 'job', 'role', 'position', 'achievement')),
+    ('Content', ('content', 'description', 'detail', 'information', 'summary')),
+)
+SUGGESTION_CATEGORY_PATTERNS = tuple(
+    (category, re.compile('|'.join(words), re.IGNORECASE)) for category, words in SUGGESTION_CATEGORY_WORDS
+)
+
+def _build_category_automaton():
+    """Aho-Corasick automaton mapping every category keyword to its category's priority, or None"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for priority, (category, words) in enumerate(SUGGESTION_CATEGORY_WORDS):
+        for word in words:
+            automaton.add_word(word, priority)
+    automaton.make_automaton()
+    return automaton
+
+SUGGESTION_CATEGORY_AUTOMATON = _build_category_automaton()
+
+def categorize_suggestion(suggestion):
+    """Highest-priority category whose keywords appear in the suggestion"""
+    if SUGGESTION_CATEGORY_AUTOMATON is None:
+        return next((name for name, pattern in SUGGESTION_CATEGORY_PATTERNS if pattern.search(suggestion)), 'General')
+    
+    # One scan finds every keyword; the best-priority hit wins, as with the ordered checks
+    priority = min((match for _, match in SUGGESTION_CATEGORY_AUTOMATON.iter(suggestion.lower())), default=None)
+    return 'General' if priority is None else SUGGESTION_CATEGORY_WORDS[priority][0]
+
+def categorize_suggestions(suggestions):
+    """Group suggestions into display categories by simple keyword matching"""
+    categorized_suggestions = {
+        'Content': [],
+        'Formatting': [],
+        'Skills': [],
+        'Experience': [],
+        'General': []
+    }
+    for suggestion in suggestions:
+        categorized_suggestions[categorize_suggestion(suggestion)].append(suggestion)
+    return categorized_suggestions
+
+# Cards shown per list before the rest moves into a "Show N more" expander
+VISIBLE_CARDS = 6
+
+def split_block(items_html, limit, wrap="%s"):
+    """(first `limit` rendered items, the rest, how many are in the rest), or None for an empty list"""
+    if not items_html:
+        return None
+    shown, more = items_html[:limit], items_html[limit:]
+    return wrap % "".join(shown), wrap % "".join(more) if more else "", len(more)
+
+def keyword_pill_row(keywords, limit, variant, icon):
+    """Keyword pills as a split_block of flex rows, or None when there are no keywords"""
+    pills = [KEYWORD_PILL_TMPL.format(variant=variant, icon=icon, text=escape_html(keyword)) for keyword in keywords]
+    return split_block(pills, limit, KEYWORD_PILL_ROW_TMPL)
+
+def build_suggestions_html(analysis, is_job_specific):
+    """Markup for each block of the suggestions view; list blocks are split_block tuples, None when empty"""
+    keywords_data = analysis.get('keywords', {})
+    fragments = {}
+    
+    if is_job_specific:
+        job_analysis = analysis.get('job_specific_analysis', {})
+        fragments['recommendations'] = "".join(
+            RECOMMENDATION_CARD_TMPL.format(number=i, text=escape_html(rec))
+            for i, rec in enumerate(analysis.get('job_specific_recommendations', []), 1)
+        )
+        fragments['gaps'] = split_block([
+            QUALIFICATION_CARD_TMPL.format(variant="red", icon="⚠️", text=escape_html(gap))
+            for gap in job_analysis.get('qualification_gaps', [])
+        ], VISIBLE_CARDS)
+        fragments['strengths'] = split_block([
+            QUALIFICATION_CARD_TMPL.format(variant="green", icon="✅", text=escape_html(strength))
+            for strength in job_analysis.get('strength_alignment', [])
+        ], VISIBLE_CARDS)
+        fragments['required_found'] = keyword_pill_row(keywords_data.get('required_skills_found', []), 6, "green", "✅")
+        fragments['required_missing'] = keyword_pill_row(keywords_data.get('required_skills_missing', []), 6, "red", "⚠️")
+        fragments['found_keywords'] = keyword_pill_row(keywords_data.get('found_keywords', []), 6, "blue", "✅")
+        fragments['missing_keywords'] = keyword_pill_row(keywords_data.get('missing_keywords', []), 6, "pink", "❌")
+    else:
+        # Combine suggestions and recommendations, then a (tab label, card list) per non-empty category
+        all_suggestions = analysis.get('suggestions', []) + analysis.get('overall_recommendations', [])
+        categories = []
+        for category, data in categorize_suggestions(all_suggestions).items():
+            if data:
+                slug = category.lower()
+                tab_label = f"{SUGGESTION_CATEGORY_ICONS[category]} {category} ({len(data)})"
+                categories.append((tab_label, split_block([
+                    SUGGESTION_ITEM_TMPL.format(slug=slug, text=escape_html(suggestion))
+                    for suggestion in data
+                ], VISIBLE_CARDS)))
+        fragments['categories'] = categories
+        fragments['missing_keywords'] = keyword_pill_row(keywords_data.get('missing_keywords', []), 8, "pink", "❌")
+        fragments['found_keywords'] = keyword_pill_row(keywords_data.get('found_keywords', []), 8, "blue", "✅")
+    
+    fragments['priorities'] = split_block([
+        PRIORITY_ACTION_TMPL.format(number=i, text=escape_html(priority))
+        for i, priority in enumerate(analysis.get('improvement_priority', []), 1)
+    ], VISIBLE_CARDS)
+    return fragments
+
+def show_block(block):
+    """Render a split_block: the first items inline, the rest in a collapsed expander"""
+    shown_html, more_html, more_count = block
+    st.markdown(shown_html, unsafe_allow_html=True)
+    if more_count:
+        with st.expander(f"Show {more_count} more", expanded=False):
+            st.markdown(more_html, unsafe_allow_html=True)
+
 def display_suggestions():
     """Display improvement suggestions with enhanced visualizations and professional design"""
-    if not st.session_state.analysis_results:
+    analysis = st.session_state.analysis_results
+    if not analysis:
         return
     
-    analysis = st.session_state.analysis_results
-    is_job_specific = 'job_match_score' in analysis
+    is_job_specific = st.session_state.is_job_specific
+    fragments = analysis_view("suggestions", lambda: build_suggestions_html(analysis, is_job_specific))
     
-    st.markdown(f"""
-    <div style="color: #667eea; font-size: 1.8rem; font-weight: bold; margin-bottom: 1rem; text-align: center; border-bottom: 2px solid #667eea; padding-bottom: 0.5rem;">
-        {st.session_state.response_title}
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(RESPONSE_TITLE_TMPL.format(title=st.session_state.response_title), unsafe_allow_html=True)
     
     if is_job_specific:
         # Enhanced Job-specific recommendations with visual cards
-        job_recommendations = analysis.get('job_specific_recommendations', [])
-        if job_recommendations:
+        if fragments['recommendations']:
             st.markdown("""
             <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
                         padding: 1.5rem; border-radius: 16px; color: white; text-align: center; margin-bottom: 2rem;">
@@ -2018,32 +1970,15 @@ def display_suggestions():
             </div>
             """, unsafe_allow_html=True)
             
-            # Display recommendations in enhanced cards
-            for i, rec in enumerate(job_recommendations, 1):
-                st.markdown(f"""
-                <div style="background: linear-gradient(135deg, #f8fafc 0%, #edf2f7 100%); 
-                            padding: 1.5rem; border-radius: 12px; margin-bottom: 1rem; 
-                            border-left: 4px solid #667eea; box-shadow: 0 4px 6px rgba(0,0,0,0.1);">
-                    <div style="display: flex; align-items: center; margin-bottom: 0.5rem;">
-                        <span style="background: #667eea; color: white; border-radius: 50%; 
-                                   width: 24px; height: 24px; display: flex; align-items: center; 
-                                   justify-content: center; font-size: 0.8rem; font-weight: bold; margin-right: 1rem;">{i}</span>
-                        <strong style="color: #2d3748;">Priority Recommendation</strong>
-                    </div>
-                    <p style="margin: 0; color: #4a5568; line-height: 1.6;">{rec}</p>
-                </div>
-                """, unsafe_allow_html=True)
+            # Display recommendations in enhanced cards, sent as one markdown block
+            st.markdown(fragments['recommendations'], unsafe_allow_html=True)
         
         # Enhanced Qualification Gaps with visual impact
-        job_analysis = analysis.get('job_specific_analysis', {})
-        qualification_gaps = job_analysis.get('qualification_gaps', [])
-        strength_alignment = job_analysis.get('strength_alignment', [])
-        
-        if qualification_gaps or strength_alignment:
+        if fragments['gaps'] or fragments['strengths']:
             col1, col2 = st.columns(2)
             
             with col1:
-                if qualification_gaps:
+                if fragments['gaps']:
                     st.markdown("""
                     <div style="background: linear-gradient(135deg, #fed7d7 0%, #feb2b2 100%); 
                                 padding: 1.5rem; border-radius: 16px; margin-bottom: 1rem;">
@@ -2055,20 +1990,10 @@ def display_suggestions():
                     </div>
                     """, unsafe_allow_html=True)
                     
-                    for gap in qualification_gaps:
-                        st.markdown(f"""
-                        <div style="background: white; padding: 1rem; border-radius: 8px; 
-                                    margin-bottom: 0.5rem; border-left: 4px solid #f56565; 
-                                    box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
-                            <div style="display: flex; align-items: center;">
-                                <span style="color: #f56565; margin-right: 0.5rem;">⚠️</span>
-                                <span style="color: #2d3748;">{gap}</span>
-                            </div>
-                        </div>
-                        """, unsafe_allow_html=True)
+                    show_block(fragments['gaps'])
             
             with col2:
-                if strength_alignment:
+                if fragments['strengths']:
                     st.markdown("""
                     <div style="background: linear-gradient(135deg, #c6f6d5 0%, #9ae6b4 100%); 
                                 padding: 1.5rem; border-radius: 16px; margin-bottom: 1rem;">
@@ -2080,17 +2005,7 @@ def display_suggestions():
                     </div>
                     """, unsafe_allow_html=True)
                     
-                    for strength in strength_alignment:
-                        st.markdown(f"""
-                        <div style="background: white; padding: 1rem; border-radius: 8px; 
-                                    margin-bottom: 0.5rem; border-left: 4px solid #48bb78; 
-                                    box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
-                            <div style="display: flex; align-items: center;">
-                                <span style="color: #48bb78; margin-right: 0.5rem;">✅</span>
-                                <span style="color: #2d3748;">{strength}</span>
-                            </div>
-                        </div>
-                        """, unsafe_allow_html=True)
+                    show_block(fragments['strengths'])
         
         # Enhanced Keywords Analysis with visual charts
         st.markdown("""
@@ -2101,17 +2016,12 @@ def display_suggestions():
         </div>
         """, unsafe_allow_html=True)
         
-        keywords_data = analysis.get('keywords', {})
-        
         # Create visual keyword comparison
         col1, col2 = st.columns(2)
         
         with col1:
             # Required Skills Analysis
-            required_found = keywords_data.get('required_skills_found', [])
-            required_missing = keywords_data.get('required_skills_missing', [])
-            
-            if required_found or required_missing:
+            if fragments['required_found'] or fragments['required_missing']:
                 st.markdown("""
                 <div style="background: white; padding: 1.5rem; border-radius: 12px; 
                             box-shadow: 0 4px 6px rgba(0,0,0,0.1); margin-bottom: 1rem;">
@@ -2119,34 +2029,17 @@ def display_suggestions():
                 </div>
                 """, unsafe_allow_html=True)
                 
-                if required_found:
+                if fragments['required_found']:
                     st.markdown("**✅ Required Skills Found:**")
-                    for skill in required_found[:6]:
-                        st.markdown(f"""
-                        <div style="background: linear-gradient(135deg, #c6f6d5 0%, #9ae6b4 100%); 
-                                    padding: 0.5rem 1rem; border-radius: 20px; margin: 0.3rem 0; 
-                                    display: inline-block; margin-right: 0.5rem;">
-                            <span style="color: #22543d; font-weight: 500;">✅ {skill}</span>
-                        </div>
-                        """, unsafe_allow_html=True)
+                    show_block(fragments['required_found'])
                 
-                if required_missing:
+                if fragments['required_missing']:
                     st.markdown("**⚠️ Required Skills Missing:**")
-                    for skill in required_missing[:6]:
-                        st.markdown(f"""
-                        <div style="background: linear-gradient(135deg, #fed7d7 0%, #feb2b2 100%); 
-                                    padding: 0.5rem 1rem; border-radius: 20px; margin: 0.3rem 0; 
-                                    display: inline-block; margin-right: 0.5rem;">
-                            <span style="color: #744210; font-weight: 500;">⚠️ {skill}</span>
-                        </div>
-                        """, unsafe_allow_html=True)
+                    show_block(fragments['required_missing'])
         
         with col2:
             # General Keywords Analysis
-            found_keywords = keywords_data.get('found_keywords', [])
-            missing_keywords = keywords_data.get('missing_keywords', [])
-            
-            if found_keywords or missing_keywords:
+            if fragments['found_keywords'] or fragments['missing_keywords']:
                 st.markdown("""
                 <div style="background: white; padding: 1.5rem; border-radius: 12px; 
                             box-shadow: 0 4px 6px rgba(0,0,0,0.1); margin-bottom: 1rem;">
@@ -2154,37 +2047,17 @@ def display_suggestions():
                 </div>
                 """, unsafe_allow_html=True)
                 
-                if found_keywords:
+                if fragments['found_keywords']:
                     st.markdown("**✅ Found Keywords:**")
-                    for keyword in found_keywords[:6]:
-                        st.markdown(f"""
-                        <div style="background: linear-gradient(135deg, #bee3f8 0%, #90cdf4 100%); 
-                                    padding: 0.5rem 1rem; border-radius: 20px; margin: 0.3rem 0; 
-                                    display: inline-block; margin-right: 0.5rem;">
-                            <span style="color: #2c5282; font-weight: 500;">✅ {keyword}</span>
-                        </div>
-                        """, unsafe_allow_html=True)
+                    show_block(fragments['found_keywords'])
                 
-                if missing_keywords:
+                if fragments['missing_keywords']:
                     st.markdown("**❌ Missing Keywords:**")
-                    for keyword in missing_keywords[:6]:
-                        st.markdown(f"""
-                        <div style="background: linear-gradient(135deg, #fbb6ce 0%, #f687b3 100%); 
-                                    padding: 0.5rem 1rem; border-radius: 20px; margin: 0.3rem 0; 
-                                    display: inline-block; margin-right: 0.5rem;">
-                            <span style="color: #97266d; font-weight: 500;">❌ {keyword}</span>
-                        </div>
-                        """, unsafe_allow_html=True)
+                    show_block(fragments['missing_keywords'])
                 
     else:
         # General analysis suggestions with enhanced visuals
-        suggestions = analysis.get('suggestions', [])
-        overall_recommendations = analysis.get('overall_recommendations', [])
-        
-        # Combine suggestions and recommendations
-        all_suggestions = suggestions + overall_recommendations
-        
-        if all_suggestions:
+        if fragments['categories']:
             st.markdown("""
             <div style="background: linear-gradient(135deg, #ffeaa7 0%, #fdcb6e 100%); 
                         padding: 1.5rem; border-radius: 16px; color: #8b4513; text-align: center; margin-bottom: 2rem;">
@@ -2193,67 +2066,11 @@ def display_suggestions():
             </div>
             """, unsafe_allow_html=True)
             
-            # Display suggestions in categories with visual appeal
-            categorized_suggestions = {
-                'Content': [],
-                'Formatting': [],
-                'Skills': [],
-                'Experience': [],
-                'General': []
-            }
-            
-            for suggestion in all_suggestions:
-                # Simple categorization based on keywords
-                suggestion_lower = suggestion.lower()
-                if any(word in suggestion_lower for word in ['keyword', 'skill', 'technology', 'programming', 'technical']):
-                    categorized_suggestions['Skills'].append(suggestion)
-                elif any(word in suggestion_lower for word in ['format', 'layout', 'structure', 'organize', 'section']):
-                    categorized_suggestions['Formatting'].append(suggestion)
-                elif any(word in suggestion_lower for word in ['experience', 'work', 'job', 'role', 'position', 'achievement']):
-                    categorized_suggestions['Experience'].append(suggestion)
-                elif any(word in suggestion_lower for word in ['content', 'description', 'detail', 'information', 'summary']):
-                    categorized_suggestions['Content'].append(suggestion)
-                else:
-                    categorized_suggestions['General'].append(suggestion)
-            
-            # Display categorized suggestions
-            categories_with_icons = {
-                'Skills': {'icon': '🔧', 'color': '#667eea', 'bg': '#e6f3ff'},
-                'Content': {'icon': '📝', 'color': '#48bb78', 'bg': '#e6fffa'},
-                'Experience': {'icon': '💼', 'color': '#ed8936', 'bg': '#fff5e6'},
-                'Formatting': {'icon': '🎨', 'color': '#9f7aea', 'bg': '#f7fafc'},
-                'General': {'icon': '💡', 'color': '#e53e3e', 'bg': '#fed7d7'}
-            }
-            
-            cols = st.columns(2)
-            col_index = 0
-            
-            for category, data in categorized_suggestions.items():
-                if data:  # Only show categories that have suggestions
-                    with cols[col_index % 2]:
-                        st.markdown(f"""
-                        <div style="background: {categories_with_icons[category]['bg']}; 
-                                    padding: 1rem; border-radius: 12px; margin-bottom: 1rem; 
-                                    border-left: 4px solid {categories_with_icons[category]['color']};">
-                            <h4 style="color: {categories_with_icons[category]['color']}; margin: 0 0 1rem 0;">
-                                {categories_with_icons[category]['icon']} {category} Improvements
-                            </h4>
-                        </div>
-                        """, unsafe_allow_html=True)
-                        
-                        for suggestion in data:
-                            st.markdown(f"""
-                            <div style="background: white; padding: 1rem; border-radius: 8px; 
-                                        margin-bottom: 0.5rem; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
-                                <div style="display: flex; align-items: flex-start;">
-                                    <span style="color: {categories_with_icons[category]['color']}; 
-                                               margin-right: 0.5rem; margin-top: 0.1rem;">•</span>
-                                    <span style="color: #2d3748; line-height: 1.5;">{suggestion}</span>
-                                </div>
-                            </div>
-                            """, unsafe_allow_html=True)
-                    
-                    col_index += 1
+            # One tab per category that has suggestions
+            tabs = st.tabs([tab_label for tab_label, _ in fragments['categories']])
+            for tab, (_, category_block) in zip(tabs, fragments['categories']):
+                with tab:
+                    show_block(category_block)
         
         # General keywords analysis with enhanced visuals
         st.markdown("""
@@ -2264,13 +2081,10 @@ def display_suggestions():
         </div>
         """, unsafe_allow_html=True)
         
-        keywords_data = analysis.get('keywords', {})
-        
         col1, col2 = st.columns(2)
         
         with col1:
-            missing_keywords = keywords_data.get('missing_keywords', [])
-            if missing_keywords:
+            if fragments['missing_keywords']:
                 st.markdown("""
                 <div style="background: white; padding: 1.5rem; border-radius: 12px; 
                             box-shadow: 0 4px 6px rgba(0,0,0,0.1); margin-bottom: 1rem;">
@@ -2279,18 +2093,10 @@ def display_suggestions():
                 """, unsafe_allow_html=True)
                 
                 st.markdown("**❌ Consider adding these keywords:**")
-                for keyword in missing_keywords[:8]:
-                    st.markdown(f"""
-                    <div style="background: linear-gradient(135deg, #fbb6ce 0%, #f687b3 100%); 
-                                padding: 0.5rem 1rem; border-radius: 20px; margin: 0.3rem 0; 
-                                display: inline-block; margin-right: 0.5rem;">
-                        <span style="color: #97266d; font-weight: 500;">❌ {keyword}</span>
-                    </div>
-                    """, unsafe_allow_html=True)
+                show_block(fragments['missing_keywords'])
         
         with col2:
-            found_keywords = keywords_data.get('found_keywords', [])
-            if found_keywords:
+            if fragments['found_keywords']:
                 st.markdown("""
                 <div style="background: white; padding: 1.5rem; border-radius: 12px; 
                             box-shadow: 0 4px 6px rgba(0,0,0,0.1); margin-bottom: 1rem;">
@@ -2299,18 +2105,10 @@ def display_suggestions():
                 """, unsafe_allow_html=True)
                 
                 st.markdown("**✅ Keywords already in your resume:**")
-                for keyword in found_keywords[:8]:
-                    st.markdown(f"""
-                    <div style="background: linear-gradient(135deg, #bee3f8 0%, #90cdf4 100%); 
-                                padding: 0.5rem 1rem; border-radius: 20px; margin: 0.3rem 0; 
-                                display: inline-block; margin-right: 0.5rem;">
-                        <span style="color: #2c5282; font-weight: 500;">✅ {keyword}</span>
-                    </div>
-                    """, unsafe_allow_html=True)
+                show_block(fragments['found_keywords'])
     
     # Priority improvements (common to both types) with enhanced styling
-    improvement_priority = analysis.get('improvement_priority', [])
-    if improvement_priority:
+    if fragments['priorities']:
         st.markdown("""
         <div style="background: linear-gradient(135deg, #ff9a9e 0%, #fecfef 100%); 
                     padding: 1.5rem; border-radius: 16px; color: #744210; text-align: center; margin: 2rem 0 1rem 0;">
@@ -2319,33 +2117,23 @@ def display_suggestions():
         </div>
         """, unsafe_allow_html=True)
         
-        for i, priority in enumerate(improvement_priority, 1):
-            st.markdown(f"""
-            <div style="background: white; padding: 1.5rem; border-radius: 12px; margin-bottom: 1rem; 
-                        border-left: 4px solid #f093fb; box-shadow: 0 4px 6px rgba(0,0,0,0.1);">
-                <div style="display: flex; align-items: center; margin-bottom: 0.5rem;">
-                    <span style="background: #f093fb; color: white; border-radius: 50%; 
-                               width: 28px; height: 28px; display: flex; align-items: center; 
-                               justify-content: center; font-size: 0.9rem; font-weight: bold; margin-right: 1rem;">{i}</span>
-                    <strong style="color: #2d3748;">High Priority Action</strong>
-                </div>
-                <p style="margin: 0; color: #4a5568; line-height: 1.6; margin-left: 3rem;">{priority}</p>
-            </div>
-            """, unsafe_allow_html=True)
+        show_block(fragments['priorities'])
 
 def display_auto_improve():
     """Display auto-improvement options - enhanced for job-specific optimization"""
-    if not st.session_state.analysis_results:
+    # Read session state once; the dict and set below are mutated in place, so the locals stay current
+    state = st.session_state
+    analysis = state.analysis_results
+    if not analysis:
         return
     
-    analysis = st.session_state.analysis_results
-    is_job_specific = 'job_match_score' in analysis
+    is_job_specific = state.is_job_specific
+    fixed_sections = state.fixed_sections
+    improved_sections = state.improved_sections
+    fixing_section = state.fixing_section
+    job_description = state.get('job_description', '') if is_job_specific else None
     
-    st.markdown(f"""
-    <div style="color: #667eea; font-size: 1.8rem; font-weight: bold; margin-bottom: 1rem; text-align: center; border-bottom: 2px solid #667eea; padding-bottom: 0.5rem;">
-        {st.session_state.response_title}
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(RESPONSE_TITLE_TMPL.format(title=state.response_title), unsafe_allow_html=True)
     
     if is_job_specific:
         st.info("🎯 **Job-Specific Optimization**: These improvements are tailored to the specific job you're applying for!")
@@ -2358,10 +2146,10 @@ def display_auto_improve():
         st.info("💡 **General ATS Optimization**: Upload a job description for job-specific improvements!")
     
     # Show fixes summary if any sections have been fixed
-    if st.session_state.fixed_sections:
+    if fixed_sections:
         st.markdown("### ✅ Fixed Sections Summary")
-        cols = st.columns(min(len(st.session_state.fixed_sections), 4))
-        for i, section_name in enumerate(st.session_state.fixed_sections):
+        cols = st.columns(min(len(fixed_sections), 4))
+        for i, section_name in enumerate(fixed_sections):
             with cols[i % 4]:
                 if is_job_specific:
                     st.success(f"🎯 {section_name.replace('_', ' ').title()}")
@@ -2374,24 +2162,48 @@ def display_auto_improve():
     else:
         st.markdown("### 🔧 Select sections to auto-improve:")
     
-    sections = st.session_state.analysis_results.get('sections_analysis', {})
+    sections = analysis.get('sections_analysis', {})
+    
+    # Improve every remaining section in one Gemini round-trip
+    pending_sections = {
+        section_name: (section_data.get('content', ''), section_data.get('suggestions', []))
+        for section_name, section_data in sections.items()
+        if section_data and section_data.get('suggestions') and section_name not in fixed_sections
+    }
+    if len(pending_sections) > 1:
+        fix_all_text = "🎯 Optimize All Sections" if is_job_specific else "🔧 Fix All Sections"
+        if st.button(fix_all_text, key="fix_all_sections", type="primary"):
+            # Only replies that actually changed a section count as fixes
+            improved = {
+                name: content
+                for name, content in generate_improved_sections(pending_sections, job_description).items()
+                if content != pending_sections[name][0]
+            }
+            if improved:
+                improved_sections.update(improved)
+                fixed_sections.update(improved)
+                save_fixes()
+                st.toast(f"{len(improved)} sections {'optimized' if is_job_specific else 'improved'}!", icon="🎯" if is_job_specific else "✅")
+                st.rerun(scope="fragment")
+    
     for section_name, section_data in sections.items():
         if section_data and section_data.get('suggestions'):
             # Apply CSS class based on status
             container_class = ""
-            if section_name in st.session_state.fixed_sections:
+            if section_name in fixed_sections:
                 container_class = "fixed-section"
-            elif st.session_state.fixing_section == section_name:
+            elif fixing_section == section_name:
                 container_class = "fixing-section"
             
             if container_class:
                 st.markdown(f'<div class="{container_class}">', unsafe_allow_html=True)
             
             col1, col2 = st.columns([3, 1])
+            fix_clicked = False
             
             with col1:
                 # Check if this section has been fixed
-                if section_name in st.session_state.fixed_sections:
+                if section_name in fixed_sections:
                     if is_job_specific:
                         st.markdown(f"**{section_name.replace('_', ' ').title()}** 🎯 (Score: {section_data.get('score', 0)}%) - **OPTIMIZED FOR JOB**")
                     else:
@@ -2402,43 +2214,47 @@ def display_auto_improve():
                 # Show relevant suggestions preview
                 suggestions = section_data.get('suggestions', [])
                 if is_job_specific:
-                    st.markdown(f"Job-specific improvements: {', '.join(suggestions[:2])}")
+                    st.markdown(f"Job-specific improvements: {', '.join(islice(suggestions, 2))}")
                 else:
-                    st.markdown(f"Suggestions: {', '.join(suggestions[:2])}")
+                    st.markdown(f"Suggestions: {', '.join(islice(suggestions, 2))}")
             
             with col2:
                 # Show different button states
-                if section_name in st.session_state.fixed_sections:
+                if section_name in fixed_sections:
                     if is_job_specific:
                         st.success("🎯 Optimized!")
                     else:
                         st.success("✅ Fixed!")
-                elif st.session_state.fixing_section == section_name:
+                elif fixing_section == section_name:
                     st.info("🔧 Optimizing...")
                 else:
                     button_text = "🎯 Optimize" if is_job_specific else "🔧 Fix"
-                    if st.button(button_text, key=f"fix_{section_name}"):
-                        content = section_data.get('content', '')
-                        suggestions = section_data.get('suggestions', [])
-                        
-                        # Pass job-specific context if available
-                        job_description = st.session_state.get('job_description', '')
-                        improved_content = generate_improved_section(content, suggestions, job_description if is_job_specific else None)
-                        
-                        if improved_content:
-                            st.session_state.improved_sections[section_name] = improved_content
-                            st.session_state.fixed_sections.add(section_name)
-                            if is_job_specific:
-                                st.success(f"🎯 {section_name.replace('_', ' ').title()} optimized for this job!")
-                            else:
-                                st.success(f"✅ {section_name.replace('_', ' ').title()} improved!")
-                            st.rerun()
+                    fix_clicked = st.button(button_text, key=f"fix_{section_name}")
+            
+            # Generated outside the columns so the streamed text uses the full width
+            if fix_clicked:
+                content = section_data.get('content', '')
+                suggestions = section_data.get('suggestions', [])
+                
+                # Pass job-specific context if available
+                improved_content = generate_improved_section(content, suggestions, job_description)
+                
+                if improved_content and improved_content != content:
+                    improved_sections[section_name] = improved_content
+                    fixed_sections.add(section_name)
+                    save_fixes()
+                    # A toast survives the rerun below; an st.success here would be wiped before it paints
+                    if is_job_specific:
+                        st.toast(f"{section_name.replace('_', ' ').title()} optimized for this job!", icon="🎯")
+                    else:
+                        st.toast(f"{section_name.replace('_', ' ').title()} improved!", icon="✅")
+                    st.rerun(scope="fragment")
             
             if container_class:
                 st.markdown('</div>', unsafe_allow_html=True)
     
     # Show improved sections with enhanced styling
-    if st.session_state.improved_sections:
+    if improved_sections:
         if is_job_specific:
             st.markdown("""
             <div class="success-card">
@@ -2454,36 +2270,12 @@ def display_auto_improve():
             </div>
             """, unsafe_allow_html=True)
         
-        for section_name, improved_content in st.session_state.improved_sections.items():
-            icon = "🎯" if is_job_specific else "📝"
-            status = "Job-Optimized" if is_job_specific else "Improved"
-            
-            with st.expander(f"{icon} {status} {section_name.replace('_', ' ').title()} ✅", expanded=True):
-                col1, col2 = st.columns([3, 1])
-                with col1:
-                    help_text = "Copy this job-optimized content to update your resume!" if is_job_specific else "Copy this improved content to update your resume!"
-                    st.text_area(
-                        f"{status} Content for {section_name.replace('_', ' ').title()}:", 
-                        improved_content, 
-                        height=200, 
-                        key=f"improved_{section_name}",
-                        help=help_text
-                    )
-                with col2:
-                    st.markdown("**Actions:**")
-                    if st.button("📋 Copy", key=f"copy_{section_name}", help="Copy to clipboard"):
-                        st.success("✅ Copied!")
-                    if st.button("📥 Download", key=f"download_{section_name}"):
-                        st.download_button(
-                            label="📄 Save as TXT",
-                            data=improved_content,
-                            file_name=f"{section_name}_improved.txt",
-                            mime="text/plain",
-                            key=f"dl_{section_name}"
-                        )
+        # Each improved section is its own fragment, so its buttons don't re-render the others
+        for section_name in improved_sections:
+            improved_section_panel(section_name, is_job_specific)
         
         # Action buttons
-        col1, col2 = st.columns(2)
+        col1, col2, col3 = st.columns(3)
         with col1:
             if st.button("📥 Download Complete Improved Resume", type="primary"):
                 improved_resume = generate_complete_resume()
@@ -2494,12 +2286,68 @@ def display_auto_improve():
                     mime="text/plain"
                 )
         with col2:
+            # One file for every section instead of a download per section
+            st.download_button(
+                label="📦 Download All Fixes (ZIP)",
+                data=improved_sections_zip(),
+                file_name="resume_fixes.zip",
+                mime="application/zip",
+                key="download_all_fixes"
+            )
+        with col3:
             if st.button("🗑️ Clear All Fixes", type="secondary"):
-                st.session_state.improved_sections = {}
-                st.session_state.fixed_sections = set()
-                st.session_state.fixing_section = None
-                st.success("✅ All fixes cleared!")
-                st.rerun()
+                clear_saved_fixes()
+                state.improved_sections = {}
+                state.fixed_sections = set()
+                state.fixing_section = None
+                state.editing_sections = set()
+                st.toast("All fixes cleared!", icon="✅")
+                st.rerun(scope="fragment")
+
+@st.fragment
+def improved_section_panel(section_name, is_job_specific):
+    """One improved section - read-only until Edit is clicked - rerun on its own"""
+    icon = "🎯" if is_job_specific else "📝"
+    status = "Job-Optimized" if is_job_specific else "Improved"
+    title = section_name.replace('_', ' ').title()
+    improved_content = st.session_state.improved_sections[section_name]
+    editing = section_name in st.session_state.editing_sections
+    
+    with st.expander(f"{icon} {status} {title} ✅", expanded=True):
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            if editing:
+                help_text = "Copy this job-optimized content to update your resume!" if is_job_specific else "Copy this improved content to update your resume!"
+                st.text_area(
+                    f"{status} Content for {title}:", 
+                    improved_content, 
+                    height=200, 
+                    key=f"improved_{section_name}",
+                    help=help_text
+                )
+            else:
+                # st.code carries its own copy button, so no widget is needed for copying
+                st.code(improved_content, language=None)
+        with col2:
+            st.markdown("**Actions:**")
+            if editing:
+                if st.button("💾 Done", key=f"done_{section_name}"):
+                    st.session_state.improved_sections[section_name] = st.session_state[f"improved_{section_name}"]
+                    save_fixes()
+                    st.session_state.editing_sections.discard(section_name)
+                    # The full resume and ZIP downloads live in the enclosing panel; a fragment rerun
+                    # would leave them serving the pre-edit text
+                    st.rerun(scope="app")
+            elif st.button("✏️ Edit", key=f"edit_{section_name}"):
+                st.session_state.editing_sections.add(section_name)
+                st.rerun(scope="fragment")
+            st.download_button(
+                label="📥 Download",
+                data=improved_content,
+                file_name=f"{section_name}_improved.txt",
+                mime="text/plain",
+                key=f"dl_{section_name}"
+            )
 
 def display_improved_section():
     """Display improved section content"""
@@ -2507,18 +2355,10 @@ def display_improved_section():
         st.error("❌ No improved content to display")
         return
     
-    st.markdown(f"""
-    <div style="color: #48bb78; font-size: 1.8rem; font-weight: bold; margin-bottom: 1rem; text-align: center; border-bottom: 2px solid #48bb78; padding-bottom: 0.5rem;">
-        ✅ {st.session_state.response_title}
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(IMPROVED_TITLE_TMPL.format(title=st.session_state.response_title), unsafe_allow_html=True)
     
     # Display the improved content in a nice formatted box
-    st.markdown("""
-    <div class="success-card">
-        <h4>📝 Improved Content</h4>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(IMPROVED_CONTENT_CARD_HTML, unsafe_allow_html=True)
     
     # Show the improved content
     st.text_area(
@@ -2542,81 +2382,8 @@ def display_improved_section():
                 mime="text/plain"
             )
 
-def show_section_analysis(section_name, section_data):
-    """Display analysis for a specific section - Same style as DOC-GPT"""
-    score = section_data.get('score', 0)
-    issues = section_data.get('issues', [])
-    suggestions = section_data.get('suggestions', [])
-    content = section_data.get('content', '')
-    
-    # Create expandable section
-    with st.expander(f"📝 {section_name.replace('_', ' ').title()} (Score: {score}%)"):
-        col1, col2 = st.columns([2, 1])
-        
-        with col1:
-            if content:
-                st.markdown("**Current Content:**")
-                st.text_area("", content, height=100, key=f"content_{section_name}")
-        
-        with col2:
-            # Score visualization
-            color = get_score_color(score)
-            st.markdown(f"""
-            <div style="text-align: center;">
-                <div style="width: 80px; height: 80px; border-radius: 50%; background: {color}; color: white; display: flex; align-items: center; justify-content: center; font-size: 1.2rem; font-weight: bold; margin: 0 auto;">
-                    {score}%
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        # Issues and suggestions
-        if issues:
-            st.markdown("**🚨 Issues Found:**")
-            for issue in issues:
-                st.markdown(f"• {issue}")
-        
-        if suggestions:
-            st.markdown("**💡 Suggestions:**")
-            for suggestion in suggestions:
-                st.markdown(f"• {suggestion}")
-            
-            # Auto-fix button with enhanced feedback
-            if section_name in st.session_state.fixed_sections:
-                # Already fixed - show persistent success
-                st.success("✅ Fixed!")
-                col1, col2 = st.columns(2)
-                with col1:
-                    if st.button(f"🔄 Fix Again", key=f"refix_{section_name}"):
-                        st.session_state.fixed_sections.discard(section_name)
-                        st.rerun()
-                with col2:
-                    if st.button(f"👁️ View Fixes", key=f"view_{section_name}"):
-                        # Navigate to Auto Improve section to see all improvements
-                        st.session_state.response_type = "improve"
-                        st.session_state.response_title = "🔧 Auto-Improve Your Resume"
-                        st.session_state.response_content = "auto_improve"
-                        st.rerun()
-            elif st.session_state.fixing_section == section_name:
-                # Currently fixing - show progress
-                st.info("🔧 Fixing... Please wait")
-            else:
-                # Ready to fix
-                if st.button(f"🔧 Auto-Fix {section_name.replace('_', ' ').title()}", key=f"autofix_{section_name}"):
-                    st.session_state.fixing_section = section_name
-                    with st.spinner(f"Improving {section_name}..."):
-                        improved_content = generate_improved_section(content, suggestions)
-                        if improved_content:
-                            st.session_state.improved_sections[section_name] = improved_content
-                            st.session_state.fixed_sections.add(section_name)
-                            st.session_state.fixing_section = None
-                            st.success("✅ Section improved! Check results above.")
-                            st.rerun()
-                        else:
-                            st.session_state.fixing_section = None
-                            st.error("❌ Failed to improve section. Please try again.")
-
-def get_score_color(score):
-    """Get color based on score - Same logic as before"""
+def _score_band_color(score):
+    """Color band for a score - Same logic as before"""
     if score >= 80:
         return "#48bb78"  # Green
     elif score >= 60:
@@ -2626,6 +2393,31 @@ def get_score_color(score):
     else:
         return "#f56565"  # Red
 
+# Every whole percentage maps to its band color; the thresholds are integers so flooring is exact
+SCORE_COLORS = tuple(_score_band_color(score) for score in range(101))
+
+def get_score_color(score):
+    """Get color based on score via the precomputed table"""
+    return SCORE_COLORS[min(max(int(score), 0), 100)]
+
+def get_score_colors(analysis):
+    """Colors for the headline scores, computed once when an analysis is stored"""
+    return {
+        "overall": get_score_color(analysis.get('overall_score', 0)),
+        "job": get_score_color(analysis.get('job_match_score', 0)),
+        "ats": get_score_color(analysis.get('ats_compatibility', 0)),
+        "format": get_score_color(analysis.get('formatting', {}).get('score', 0)),
+    }
+
+# Response type -> renderer, built once the display functions are defined
+RESPONSE_RENDERERS = {
+    "analysis": display_analysis_results,
+    "score": display_ats_score,
+    "suggestions": display_suggestions,
+    "improve": display_auto_improve,
+    "improvement": display_improved_section,
+}
+
 # Main entry point
 if __name__ == "__main__":
     main()
@@ -0,0 +1,34 @@
+import pytest
+
+pytest.importorskip("streamlit")
+pytest.importorskip("dotenv")
+
+import app
+
+
+REPLACEMENTS = [
+    ("Python developer", "Senior Python engineer"),
+    ("Led a team", "Led a team of 5"),
+    ("Python developer", "Backend Python developer"),
+]
+TEXT = "Summary: Python developer. Experience: Led a team."
+
+
+def test_duplicate_originals_without_automaton(monkeypatch):
+    monkeypatch.setattr(app, "ahocorasick", None)
+    assert app.find_replacement_spans(TEXT, REPLACEMENTS) == [
+        (9, 25, "Senior Python engineer"),
+        (9, 25, "Backend Python developer"),
+        (39, 49, "Led a team of 5"),
+    ]
+
+
+def test_duplicate_originals_match_fallback():
+    if app.ahocorasick is None:
+        pytest.skip("pyahocorasick is not installed")
+    spans = app.find_replacement_spans(TEXT, REPLACEMENTS)
+    assert spans == [
+        (9, 25, "Senior Python engineer"),
+        (9, 25, "Backend Python developer"),
+        (39, 49, "Led a team of 5"),
+    ]
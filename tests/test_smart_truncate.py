@@ -0,0 +1,36 @@
+import pytest
+
+pytest.importorskip("streamlit")
+pytest.importorskip("dotenv")
+
+import app
+
+
+def test_all_caps_employer_lines_stay_in_experience():
+    text = (
+        "Jane Roe\n"
+        "EXPERIENCE\n"
+        "ACME CORPORATION\n"
+        "Senior engineer\n"
+        "GLOBEX INC\n"
+        "Lead dev\n"
+        "EDUCATION\n"
+        "MIT\n"
+        "APPENDIX\n"
+        + "x" * 500
+    )
+    assert app._smart_truncate(text, max_chars=200) == (
+        "Jane Roe\n"
+        "EXPERIENCE\n"
+        "ACME CORPORATION\n"
+        "Senior engineer\n"
+        "GLOBEX INC\n"
+        "Lead dev\n"
+        "EDUCATION\n"
+        "MIT\n"
+    )
+
+
+def test_inline_label_does_not_end_a_section():
+    text = "Jane\nSkills\nPython\nLanguages: English, French\nReferences\nBob\n"
+    assert app._smart_truncate(text, max_chars=200) == "Jane\nSkills\nPython\nLanguages: English, French\n"